@@ -14,22 +14,47 @@ const API_BASE = 'https://api.clickup.com/api/v2';
 const LIST_CACHE_TTL_MS = 60 * 1000;
 const SQL_CACHE_REFRESH_MS = 10 * 60 * 1000;
 const COMMENT_CACHE_TTL_MS = 2 * 60 * 1000;
+const COMMENT_FETCH_CONCURRENCY = Math.max(1, Number(process.env.CLICKUP_COMMENT_CONCURRENCY || 4) || 4);
+const PAGE_FETCH_CONCURRENCY = Math.max(1, Number(process.env.CLICKUP_PAGE_CONCURRENCY || 3) || 3);
 
 let listCacheRows = null;
 let listCacheUntil = 0;
 let listCacheInFlight = null;
+const COMMENT_CACHE_MAX = 1000;
 const commentCache = new Map();
 const commentInFlight = new Map();
 
-async function fetchJson(path, init = {}) {
+function rememberComment(key, value) {
+  // One clock read covers both the eviction sweep and the new expiry.
+  const now = Date.now();
+  if (commentCache.size >= COMMENT_CACHE_MAX) {
+    for (const [k, entry] of commentCache) {
+      if (entry.until <= now) commentCache.delete(k);
+    }
+    if (commentCache.size >= COMMENT_CACHE_MAX) commentCache.clear();
+  }
+  commentCache.set(key, { value, until: now + COMMENT_CACHE_TTL_MS });
+}
+
+// Base request headers are identical for every call with the same token;
+// rebuild them only when the token changes. Connection reuse itself comes
+// from the platform fetch (undici) keep-alive pool.
+let authHeadersToken = '';
+let authHeaders = null;
+
+function baseHeaders() {
   const token = required('CLICKUP_API_TOKEN');
+  if (token !== authHeadersToken) {
+    authHeadersToken = token;
+    authHeaders = { Authorization: token, 'Content-Type': 'application/json' };
+  }
+  return authHeaders;
+}
+
+async function fetchJson(path, init = {}) {
   const response = await fetch(`${API_BASE}${path}`, {
     ...init,
-    headers: {
-      Authorization: token,
-      'Content-Type': 'application/json',
-      ...(init.headers || {}),
-    },
+    headers: init.headers ? { ...baseHeaders(), ...init.headers } : baseHeaders(),
   });
   if (!response.ok) {
     const text = await response.text();
@@ -38,10 +63,6 @@ async function fetchJson(path, init = {}) {
   return response.json();
 }
 
-function getCustomField(task, fieldId) {
-  return (task.custom_fields || []).find((f) => String(f.id) === String(fieldId));
-}
-
 function customFieldDisplayValue(field) {
   if (!field || field.value == null) return '';
   const type = String(field.type || '').toLowerCase();
@@ -60,26 +81,44 @@ function customFieldDisplayValue(field) {
   return String(value);
 }
 
+// Specialized [metricKey, fieldId] pairs for the per-task metric loop:
+// entries are materialized and ids stringified once per field-map value
+// instead of per task.
+let fieldMapEntriesSource = null;
+let fieldMapEntries = [];
+
+function fieldMapEntriesFor(fieldMap) {
+  if (fieldMap !== fieldMapEntriesSource) {
+    fieldMapEntriesSource = fieldMap;
+    fieldMapEntries = Object.entries(fieldMap).map(([metricKey, fieldId]) => [metricKey, String(fieldId)]);
+  }
+  return fieldMapEntries;
+}
+
+function isMonthPlanningField(field) {
+  const n = normalizeText(field?.name || '');
+  return n.includes('month year') || n.includes('primary work month') || n === 'work month';
+}
+
 function normalizeTask(task) {
   const fieldMap = parseFieldMap();
   const sfIdField = required('CLICKUP_SF_ID_FIELD_ID');
-  const sfField = getCustomField(task, sfIdField);
+  const customFields = Array.isArray(task.custom_fields) ? task.custom_fields : [];
+  // One id-keyed index per task replaces an O(fields) scan per mapped metric.
+  const fieldsById = new Map(customFields.map((f) => [String(f.id), f]));
+  const sfField = fieldsById.get(String(sfIdField));
   const sfId = customFieldDisplayValue(sfField).trim();
   if (!sfId) return null;
 
   const metrics = {};
-  for (const [metricKey, fieldId] of Object.entries(fieldMap)) {
-    metrics[metricKey] = customFieldDisplayValue(getCustomField(task, fieldId));
+  for (const [metricKey, fieldId] of fieldMapEntriesFor(fieldMap)) {
+    metrics[metricKey] = customFieldDisplayValue(fieldsById.get(fieldId));
   }
 
   // Fallback: auto-detect month/year style planning fields when not mapped explicitly.
   // This keeps assessor work-month filtering working even if CLICKUP_FIELD_MAP_JSON
   // does not include these fields yet.
-  const customFields = Array.isArray(task.custom_fields) ? task.custom_fields : [];
-  const monthField = customFields.find((f) => {
-    const n = normalizeText(f?.name || '');
-    return n.includes('month year') || n.includes('primary work month') || n === 'work month';
-  });
+  const monthField = customFields.find(isMonthPlanningField);
   if (monthField) {
     const monthValue = customFieldDisplayValue(monthField);
     if (monthValue) {
@@ -90,37 +129,42 @@ function normalizeTask(task) {
 
   return {
     sf_id: sfId,
+    // id may be numeric, so it keeps the String() wrap; name, url, and
+    // status arrive from the API as strings already.
     task_id: String(task.id || ''),
-    task_name: String(task.name || ''),
-    task_url: String(task.url || ''),
-    task_status: String(task.status?.status || ''),
+    task_name: task.name || '',
+    task_url: task.url || '',
+    task_status: task.status?.status || '',
     task_status_type: normalizeText(task.status?.type || ''),
     task_created_at: toDateUS(task.date_created),
     task_closed_at: toDateUS(task.date_closed),
     source_updated_at: toDateUS(task.date_updated),
+    // Present from the start so live and SQL-cached rows share one shape;
+    // the status handler fills it in from the snapshot timestamp.
+    synced_at: '',
     metrics,
   };
 }
 
-function pickBestBySf(rows) {
-  const bySf = new Map();
-  for (const row of rows) {
-    const cur = bySf.get(row.sf_id);
-    if (!cur) {
-      bySf.set(row.sf_id, row);
-      continue;
-    }
-    const curClosed = cur.task_status_type === 'closed';
-    const rowClosed = row.task_status_type === 'closed';
-    if (curClosed && !rowClosed) {
-      bySf.set(row.sf_id, row);
-      continue;
-    }
-    const curTime = Date.parse(cur.source_updated_at || '') || 0;
-    const rowTime = Date.parse(row.source_updated_at || '') || 0;
-    if (rowTime >= curTime) bySf.set(row.sf_id, row);
+// Parsed source_updated_at values, keyed off-row so the timestamps never
+// leak into serialized row JSON.
+const rowUpdatedMs = new WeakMap();
+
+function updatedMs(row) {
+  let ms = rowUpdatedMs.get(row);
+  if (ms === undefined) {
+    ms = Date.parse(row.source_updated_at || '') || 0;
+    rowUpdatedMs.set(row, ms);
   }
-  return Array.from(bySf.values());
+  return ms;
+}
+
+function isBetterRow(row, cur) {
+  if (!cur) return true;
+  const curClosed = cur.task_status_type === 'closed';
+  const rowClosed = row.task_status_type === 'closed';
+  if (curClosed && !rowClosed) return true;
+  return updatedMs(row) >= updatedMs(cur);
 }
 
 function preserveNextStepsFromCached(rows, cachedRows) {
@@ -177,32 +221,43 @@ async function fetchListRows(options = {}) {
 
   const run = (async () => {
   const listId = required('CLICKUP_LIST_ID');
-  const all = [];
-  let cachedRowsForMerge = null;
-  if (!includeComments && hasSqlConfig()) {
-    try {
-      const cached = await getCachedClickupRows();
-      cachedRowsForMerge = cached && Array.isArray(cached.rows) ? cached.rows : null;
-    } catch (_) {
-      cachedRowsForMerge = null;
-    }
-  }
+  // Best-per-sf_id is resolved while paginating instead of collecting
+  // every task row and deduplicating afterwards.
+  const bySf = new Map();
+  // Overlap the SQL snapshot read (used only for the next-steps merge) with
+  // the ClickUp pagination instead of serializing the two.
+  const cachedRowsPromise = !includeComments && hasSqlConfig()
+    ? getCachedClickupRows()
+        .then((cached) => (cached && Array.isArray(cached.rows) ? cached.rows : null))
+        .catch(() => null)
+    : Promise.resolve(null);
+  // ClickUp pagination gives no total up front, so fetch speculative waves
+  // of pages concurrently and stop at the first short page. Pages are
+  // processed in order, which keeps isBetterRow tie-breaking stable.
   let page = 0;
-  while (true) {
-    const data = await fetchJson(`/list/${listId}/task?include_closed=true&page=${page}`);
-    const tasks = Array.isArray(data.tasks) ? data.tasks : [];
-    for (const t of tasks) {
-      const row = normalizeTask(t);
-      if (row) all.push(row);
+  let sawShortPage = false;
+  while (!sawShortPage) {
+    const wave = [];
+    for (let i = 0; i < PAGE_FETCH_CONCURRENCY; i += 1) {
+      wave.push(fetchJson(`/list/${listId}/task?include_closed=true&page=${page + i}`));
+    }
+    page += PAGE_FETCH_CONCURRENCY;
+    for (const data of await Promise.all(wave)) {
+      if (sawShortPage) break;
+      const tasks = Array.isArray(data.tasks) ? data.tasks : [];
+      for (const t of tasks) {
+        const row = normalizeTask(t);
+        if (row && isBetterRow(row, bySf.get(row.sf_id))) bySf.set(row.sf_id, row);
+      }
+      if (tasks.length < 100) sawShortPage = true;
     }
-    if (tasks.length < 100) break;
-    page += 1;
   }
-    const rows = pickBestBySf(all);
+    const rows = Array.from(bySf.values());
     if (includeComments) {
       await hydrateNextStepsFromComments(rows);
-    } else if (cachedRowsForMerge) {
-      preserveNextStepsFromCached(rows, cachedRowsForMerge);
+    } else {
+      const cachedRowsForMerge = await cachedRowsPromise;
+      if (cachedRowsForMerge) preserveNextStepsFromCached(rows, cachedRowsForMerge);
     }
     listCacheRows = rows;
     listCacheUntil = Date.now() + LIST_CACHE_TTL_MS;
@@ -220,32 +275,38 @@ async function fetchListRows(options = {}) {
   }
 }
 
-async function hydrateNextStepsFromComments(rows) {
-  const targets = (Array.isArray(rows) ? rows : []).filter((row) => {
-    const current = String(row?.metrics?.['project.next_steps'] || '').trim();
-    return !current && String(row?.task_id || '').trim();
-  });
-  if (!targets.length) return;
-
-  const concurrency = 4;
+// Run fn over each item with a bounded number of workers. Per-item
+// failures are swallowed so one bad item cannot sink the batch.
+async function runWithConcurrency(items, concurrency, fn) {
+  if (!items.length) return;
   let idx = 0;
   async function worker() {
-    while (idx < targets.length) {
+    while (idx < items.length) {
       const currentIdx = idx;
       idx += 1;
-      const row = targets[currentIdx];
       try {
-        const latestComment = await fetchLatestTaskComment(row.task_id);
-        if (latestComment) {
-          row.metrics = row.metrics || {};
-          row.metrics['project.next_steps'] = latestComment;
-        }
+        await fn(items[currentIdx]);
       } catch (_) {
-        // Ignore per-task failures; keep refresh running for other rows.
+        // Ignore per-item failures; keep the remaining work running.
       }
     }
   }
-  await Promise.all(Array.from({ length: Math.min(concurrency, targets.length) }, () => worker()));
+  await Promise.all(Array.from({ length: Math.min(concurrency, items.length) }, () => worker()));
+}
+
+async function hydrateNextStepsFromComments(rows) {
+  const targets = (Array.isArray(rows) ? rows : []).filter((row) => {
+    const current = String(row?.metrics?.['project.next_steps'] || '').trim();
+    return !current && String(row?.task_id || '').trim();
+  });
+
+  await runWithConcurrency(targets, COMMENT_FETCH_CONCURRENCY, async (row) => {
+    const latestComment = await fetchLatestTaskComment(row.task_id);
+    if (latestComment) {
+      row.metrics = row.metrics || {};
+      row.metrics['project.next_steps'] = latestComment;
+    }
+  });
 }
 
 async function updateCustomField(taskId, fieldId, value) {
@@ -267,14 +328,22 @@ async function fetchLatestTaskComment(taskId) {
   const data = await fetchJson(`/task/${taskId}/comment`);
   const comments = Array.isArray(data.comments) ? data.comments : [];
     if (!comments.length) {
-      commentCache.set(key, { value: '', until: Date.now() + COMMENT_CACHE_TTL_MS });
+      rememberComment(key, '');
       return '';
     }
 
-  comments.sort((a, b) => Number(b.date || 0) - Number(a.date || 0));
-  const latest = comments[0] || {};
+    // Only the newest comment matters; one pass beats sorting the array.
+    let latest = comments[0];
+    let latestDate = Number(latest.date || 0);
+    for (let i = 1; i < comments.length; i += 1) {
+      const d = Number(comments[i].date || 0);
+      if (d > latestDate) {
+        latest = comments[i];
+        latestDate = d;
+      }
+    }
     const text = String(latest.comment_text || '').trim();
-    commentCache.set(key, { value: text, until: Date.now() + COMMENT_CACHE_TTL_MS });
+    rememberComment(key, text);
     return text;
   })();
 
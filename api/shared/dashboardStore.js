@@ -1,25 +1,64 @@
 let poolPromise = null;
 let schemaReady = false;
+let schemaPromise = null;
+let sqlModule = null;
 
 function hasSqlConfig() {
   return Boolean((process.env.AZURE_SQL_CONNECTION_STRING || '').trim());
 }
 
+function getSql() {
+  if (!sqlModule) sqlModule = require('mssql');
+  return sqlModule;
+}
+
 async function getPool() {
   if (!hasSqlConfig()) return null;
   if (!poolPromise) {
-    const sql = require('mssql');
-    poolPromise = sql.connect(process.env.AZURE_SQL_CONNECTION_STRING);
+    // Drop the shared promise on connect failure or pool-level errors so the
+    // next caller reconnects instead of reusing a dead pool forever.
+    const connecting = getSql()
+      .connect(process.env.AZURE_SQL_CONNECTION_STRING)
+      .then((pool) => {
+        pool.on('error', () => {
+          if (poolPromise === connecting) {
+            poolPromise = null;
+            schemaReady = false;
+          }
+        });
+        return pool;
+      })
+      .catch((err) => {
+        if (poolPromise === connecting) poolPromise = null;
+        throw err;
+      });
+    poolPromise = connecting;
   }
   const pool = await poolPromise;
   if (!schemaReady) {
-    await ensureSchema(pool);
-    schemaReady = true;
+    // Single-flight the schema batch so concurrent first callers share one
+    // run instead of each issuing the DDL.
+    if (!schemaPromise) {
+      schemaPromise = ensureSchema(pool)
+        .then(() => {
+          schemaReady = true;
+        })
+        .finally(() => {
+          schemaPromise = null;
+        });
+    }
+    await schemaPromise;
   }
   return pool;
 }
 
 async function ensureSchema(pool) {
+  // Probe the newest schema object first: when it already exists the whole
+  // conditional DDL batch can be skipped with one cheap query.
+  const probe = await pool.request().query(
+    "SELECT CASE WHEN EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_clickup_rows_synced_at' AND object_id = OBJECT_ID(N'dbo.clickup_rows')) THEN 1 ELSE 0 END AS ready;"
+  );
+  if (probe.recordset?.[0]?.ready) return;
   const sqlText = `
 IF OBJECT_ID(N'dbo.ecd_overrides', N'U') IS NULL
 BEGIN
@@ -70,10 +109,61 @@ BEGIN
     synced_at DATETIME2 NOT NULL CONSTRAINT DF_clickup_rows_synced_at DEFAULT SYSUTCDATETIME()
   );
 END;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_clickup_rows_synced_at' AND object_id = OBJECT_ID(N'dbo.clickup_rows'))
+BEGIN
+  CREATE INDEX IX_clickup_rows_synced_at ON dbo.clickup_rows (synced_at DESC);
+END;
 `;
   await pool.request().batch(sqlText);
 }
 
+// Static query texts shared by every call; only the multi-row override
+// INSERT is built dynamically.
+const SELECT_OVERRIDES_SQL = `
+  SELECT metric_key, value
+  FROM dbo.ecd_overrides
+  WHERE sf_id = @sf_id AND metric_key <> ''
+`;
+
+const INSERT_AUDIT_EVENT_SQL = `
+  SET NOCOUNT ON;
+  INSERT INTO dbo.audit_events (sf_id, task_id, event_type, metric_key, old_value, new_value, actor, metadata_json)
+  VALUES (@sf_id, @task_id, @event_type, @metric_key, @old_value, @new_value, @actor, @metadata_json);
+`;
+
+const UPSERT_CLIENT_LINK_SQL = `
+  SET NOCOUNT ON;
+  MERGE dbo.client_links AS target
+  USING (SELECT @sf_id AS sf_id) AS src
+  ON target.sf_id = src.sf_id
+  WHEN MATCHED THEN
+    UPDATE SET sig = @sig, client_url = @client_url, last_generated_at = SYSUTCDATETIME()
+  WHEN NOT MATCHED THEN
+    INSERT (sf_id, sig, client_url) VALUES (@sf_id, @sig, @client_url);
+`;
+
+const STORAGE_HEALTH_SQL = `
+  SELECT
+    (SELECT COUNT(1) FROM dbo.ecd_overrides) AS ecd_overrides,
+    (SELECT COUNT(1) FROM dbo.audit_events) AS audit_events,
+    (SELECT COUNT(1) FROM dbo.client_links) AS client_links,
+    (SELECT COUNT(1) FROM dbo.clickup_rows) AS clickup_rows;
+`;
+
+const SELECT_CLICKUP_ROWS_SQL = `
+  SELECT row_json FROM dbo.clickup_rows;
+  SELECT MAX(synced_at) AS latest FROM dbo.clickup_rows;
+`;
+
+const SELECT_CLICKUP_ROW_SQL = `
+  SELECT TOP 1 row_json, synced_at
+  FROM dbo.clickup_rows
+  WHERE sf_id = @sf_id
+`;
+
+const DELETE_CLICKUP_ROWS_SQL = 'SET NOCOUNT ON; DELETE FROM dbo.clickup_rows;';
+
 function cleanOverridesMap(source) {
   const src = source && typeof source === 'object' ? source : {};
   const out = {};
@@ -88,25 +178,32 @@ function cleanOverridesMap(source) {
   return out;
 }
 
+// Recently fetched override maps, keyed by sf_id with a short TTL so bursts
+// of status loads share one round trip; writes invalidate their entry.
+const OVERRIDES_CACHE_TTL_MS = 30 * 1000;
+const OVERRIDES_CACHE_MAX = 500;
+const overridesCache = new Map();
+
 async function getOverrides(sfId) {
   const pool = await getPool();
   if (!pool) return null;
   const key = String(sfId || '').trim();
   if (!key) return {};
+  const cached = overridesCache.get(key);
+  if (cached && Date.now() < cached.until) return cached.value;
+  const sql = getSql();
   const result = await pool
     .request()
-    .input('sf_id', key)
-    .query(`
-      SELECT metric_key, value
-      FROM dbo.ecd_overrides
-      WHERE sf_id = @sf_id
-    `);
+    .input('sf_id', sql.NVarChar(100), key)
+    .query(SELECT_OVERRIDES_SQL);
   const out = {};
+  // Blank keys are filtered in SQL, and writes trim keys on the way in
+  // (cleanOverridesMap), so rows can be used as-is.
   for (const row of result.recordset || []) {
-    const metricKey = String(row.metric_key || '').trim();
-    if (!metricKey) continue;
-    out[metricKey] = row.value == null ? null : String(row.value);
+    out[row.metric_key] = row.value;
   }
+  if (overridesCache.size >= OVERRIDES_CACHE_MAX) overridesCache.clear();
+  overridesCache.set(key, { value: out, until: Date.now() + OVERRIDES_CACHE_TTL_MS });
   return out;
 }
 
@@ -116,27 +213,33 @@ async function replaceOverrides(sfId, overridesMap, actor = null) {
   const key = String(sfId || '').trim();
   if (!key) return false;
   const cleaned = cleanOverridesMap(overridesMap);
-  const tx = pool.transaction();
-  await tx.begin();
-  try {
-    await tx.request().input('sf_id', key).query('DELETE FROM dbo.ecd_overrides WHERE sf_id = @sf_id;');
-    for (const [metricKey, value] of Object.entries(cleaned)) {
-      await tx.request()
-        .input('sf_id', key)
-        .input('metric_key', metricKey)
-        .input('value', value)
-        .input('updated_by', actor || null)
-        .query(`
-          INSERT INTO dbo.ecd_overrides (sf_id, metric_key, value, updated_by)
-          VALUES (@sf_id, @metric_key, @value, @updated_by);
-        `);
-    }
-    await tx.commit();
-    return true;
-  } catch (err) {
-    await tx.rollback().catch(() => {});
-    throw err;
+  const sql = getSql();
+  const entries = Object.entries(cleaned);
+  // Delete + multi-row insert run inside one T-SQL transaction in a single
+  // batch, so a replace costs one round trip instead of begin/delete/insert/
+  // commit. XACT_ABORT rolls the whole batch back if any statement fails.
+  const request = pool.request()
+    .input('sf_id', sql.NVarChar(100), key)
+    .input('updated_by', sql.NVarChar(200), actor || null);
+  let insertSql = '';
+  if (entries.length) {
+    entries.forEach(([metricKey, value], i) => {
+      request.input(`metric_key_${i}`, sql.NVarChar(200), metricKey).input(`value_${i}`, sql.NVarChar(50), value);
+    });
+    const valuesSql = entries.map((_, i) => `(@sf_id, @metric_key_${i}, @value_${i}, @updated_by)`).join(', ');
+    insertSql = `
+    INSERT INTO dbo.ecd_overrides (sf_id, metric_key, value, updated_by)
+    VALUES ${valuesSql};`;
   }
+  await request.query(`
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    BEGIN TRANSACTION;
+    DELETE FROM dbo.ecd_overrides WHERE sf_id = @sf_id;${insertSql}
+    COMMIT TRANSACTION;
+  `);
+  overridesCache.delete(key);
+  return true;
 }
 
 async function recordAuditEvent({ sfId, taskId = null, eventType, metricKey = null, oldValue = null, newValue = null, actor = null, metadata = null }) {
@@ -145,40 +248,99 @@ async function recordAuditEvent({ sfId, taskId = null, eventType, metricKey = nu
   const sf = String(sfId || '').trim();
   const event = String(eventType || '').trim();
   if (!sf || !event) return false;
+  const sql = getSql();
   await pool.request()
-    .input('sf_id', sf)
-    .input('task_id', taskId ? String(taskId) : null)
-    .input('event_type', event)
-    .input('metric_key', metricKey ? String(metricKey) : null)
-    .input('old_value', oldValue == null ? null : String(oldValue))
-    .input('new_value', newValue == null ? null : String(newValue))
-    .input('actor', actor ? String(actor) : null)
-    .input('metadata_json', metadata ? JSON.stringify(metadata) : null)
-    .query(`
-      INSERT INTO dbo.audit_events (sf_id, task_id, event_type, metric_key, old_value, new_value, actor, metadata_json)
-      VALUES (@sf_id, @task_id, @event_type, @metric_key, @old_value, @new_value, @actor, @metadata_json);
-    `);
+    .input('sf_id', sql.NVarChar(100), sf)
+    .input('task_id', sql.NVarChar(100), taskId ? String(taskId) : null)
+    .input('event_type', sql.NVarChar(50), event)
+    .input('metric_key', sql.NVarChar(200), metricKey ? String(metricKey) : null)
+    .input('old_value', sql.NVarChar(sql.MAX), oldValue == null ? null : String(oldValue))
+    .input('new_value', sql.NVarChar(sql.MAX), newValue == null ? null : String(newValue))
+    .input('actor', sql.NVarChar(200), actor ? String(actor) : null)
+    .input('metadata_json', sql.NVarChar(sql.MAX), metadata ? JSON.stringify(metadata) : null)
+    .query(INSERT_AUDIT_EVENT_SQL);
   return true;
 }
 
+// Audit writes are best-effort and never need to block a response: events
+// are queued in memory (bounded, oldest dropped first) and drained in the
+// background as multi-row INSERT batches.
+const AUDIT_QUEUE_MAX = 1000;
+const AUDIT_FLUSH_BATCH = 50;
+const auditQueue = [];
+let auditFlushScheduled = false;
+
+async function recordAuditEvents(events) {
+  const pool = await getPool();
+  if (!pool) return false;
+  const valid = [];
+  for (const { sfId, taskId = null, eventType, metricKey = null, oldValue = null, newValue = null, actor = null, metadata = null } of events) {
+    const sf = String(sfId || '').trim();
+    const event = String(eventType || '').trim();
+    if (!sf || !event) continue;
+    valid.push([
+      sf,
+      taskId ? String(taskId) : null,
+      event,
+      metricKey ? String(metricKey) : null,
+      oldValue == null ? null : String(oldValue),
+      newValue == null ? null : String(newValue),
+      actor ? String(actor) : null,
+      metadata ? JSON.stringify(metadata) : null,
+    ]);
+  }
+  if (!valid.length) return false;
+  const sql = getSql();
+  const request = pool.request();
+  const valuesSql = valid.map((values, i) => {
+    request.input(`sf_id_${i}`, sql.NVarChar(100), values[0])
+      .input(`task_id_${i}`, sql.NVarChar(100), values[1])
+      .input(`event_type_${i}`, sql.NVarChar(50), values[2])
+      .input(`metric_key_${i}`, sql.NVarChar(200), values[3])
+      .input(`old_value_${i}`, sql.NVarChar(sql.MAX), values[4])
+      .input(`new_value_${i}`, sql.NVarChar(sql.MAX), values[5])
+      .input(`actor_${i}`, sql.NVarChar(200), values[6])
+      .input(`metadata_json_${i}`, sql.NVarChar(sql.MAX), values[7]);
+    return `(@sf_id_${i}, @task_id_${i}, @event_type_${i}, @metric_key_${i}, @old_value_${i}, @new_value_${i}, @actor_${i}, @metadata_json_${i})`;
+  }).join(', ');
+  await request.query(`
+    SET NOCOUNT ON;
+    INSERT INTO dbo.audit_events (sf_id, task_id, event_type, metric_key, old_value, new_value, actor, metadata_json)
+    VALUES ${valuesSql};
+  `);
+  return true;
+}
+
+function queueAuditEvent(event) {
+  if (!hasSqlConfig()) return;
+  if (auditQueue.length >= AUDIT_QUEUE_MAX) auditQueue.shift();
+  auditQueue.push(event);
+  if (auditFlushScheduled) return;
+  auditFlushScheduled = true;
+  setImmediate(async () => {
+    auditFlushScheduled = false;
+    while (auditQueue.length) {
+      const batch = auditQueue.splice(0, AUDIT_FLUSH_BATCH);
+      try {
+        await recordAuditEvents(batch);
+      } catch (_) {
+        // Drop the batch; audit logging must not disrupt request handling.
+      }
+    }
+  });
+}
+
 async function upsertClientLink({ sfId, signature, clientUrl }) {
   const pool = await getPool();
   if (!pool) return false;
   const sf = String(sfId || '').trim();
   if (!sf) return false;
+  const sql = getSql();
   await pool.request()
-    .input('sf_id', sf)
-    .input('sig', String(signature || '').trim())
-    .input('client_url', String(clientUrl || '').trim())
-    .query(`
-      MERGE dbo.client_links AS target
-      USING (SELECT @sf_id AS sf_id) AS src
-      ON target.sf_id = src.sf_id
-      WHEN MATCHED THEN
-        UPDATE SET sig = @sig, client_url = @client_url, last_generated_at = SYSUTCDATETIME()
-      WHEN NOT MATCHED THEN
-        INSERT (sf_id, sig, client_url) VALUES (@sf_id, @sig, @client_url);
-    `);
+    .input('sf_id', sql.NVarChar(100), sf)
+    .input('sig', sql.NVarChar(128), String(signature || '').trim())
+    .input('client_url', sql.NVarChar(500), String(clientUrl || '').trim())
+    .query(UPSERT_CLIENT_LINK_SQL);
   return true;
 }
 
@@ -194,12 +356,9 @@ async function storageHealth() {
   }
 
   const pool = await getPool();
-  const [overrides, audits, links, clickupRows] = await Promise.all([
-    pool.request().query('SELECT COUNT(1) AS total FROM dbo.ecd_overrides;'),
-    pool.request().query('SELECT COUNT(1) AS total FROM dbo.audit_events;'),
-    pool.request().query('SELECT COUNT(1) AS total FROM dbo.client_links;'),
-    pool.request().query('SELECT COUNT(1) AS total FROM dbo.clickup_rows;'),
-  ]);
+  // One round trip for all four counts instead of a query per table.
+  const result = await pool.request().query(STORAGE_HEALTH_SQL);
+  const counts = result.recordset?.[0] || {};
 
   return {
     sql_enabled: true,
@@ -207,38 +366,55 @@ async function storageHealth() {
     connected: true,
     schema_ready: true,
     tables: {
-      ecd_overrides: Number(overrides.recordset?.[0]?.total || 0),
-      audit_events: Number(audits.recordset?.[0]?.total || 0),
-      client_links: Number(links.recordset?.[0]?.total || 0),
-      clickup_rows: Number(clickupRows.recordset?.[0]?.total || 0),
+      ecd_overrides: Number(counts.ecd_overrides || 0),
+      audit_events: Number(counts.audit_events || 0),
+      client_links: Number(counts.client_links || 0),
+      clickup_rows: Number(counts.clickup_rows || 0),
     },
   };
 }
 
+// Cached row payloads are sizable JSON blobs; gzip them before they go over
+// the wire to SQL and mark compressed values with a prefix so plain-JSON
+// rows written by earlier builds still read back transparently.
+const ROW_JSON_GZIP_PREFIX = 'gz:';
+const ROW_JSON_GZIP_MIN_BYTES = 512;
+
+function encodeRowJson(payload) {
+  if (Buffer.byteLength(payload, 'utf8') < ROW_JSON_GZIP_MIN_BYTES) return payload;
+  return ROW_JSON_GZIP_PREFIX + require('zlib').gzipSync(payload).toString('base64');
+}
+
+function decodeRowJson(stored) {
+  const text = String(stored || '');
+  if (!text.startsWith(ROW_JSON_GZIP_PREFIX)) return text;
+  return require('zlib')
+    .gunzipSync(Buffer.from(text.slice(ROW_JSON_GZIP_PREFIX.length), 'base64'))
+    .toString('utf8');
+}
+
 async function getCachedClickupRows() {
   const pool = await getPool();
   if (!pool) return null;
+  // The batch returns the rows and lets SQL reduce MAX(synced_at) (served
+  // by the synced_at index) instead of scanning timestamps in JS.
   const result = await pool
     .request()
-    .query(`
-      SELECT sf_id, row_json, synced_at
-      FROM dbo.clickup_rows
-    `);
+    .query(SELECT_CLICKUP_ROWS_SQL);
   const rows = [];
-  let latestSyncMs = 0;
-  for (const rec of result.recordset || []) {
+  for (const rec of result.recordsets?.[0] || []) {
     try {
-      const row = JSON.parse(String(rec.row_json || '{}'));
+      const row = JSON.parse(decodeRowJson(rec.row_json) || '{}');
       if (row && typeof row === 'object') rows.push(row);
     } catch (_) {
       // Skip invalid cached rows.
     }
-    const syncedAt = rec.synced_at ? new Date(rec.synced_at).getTime() : 0;
-    if (Number.isFinite(syncedAt) && syncedAt > latestSyncMs) latestSyncMs = syncedAt;
   }
+  const latest = result.recordsets?.[1]?.[0]?.latest || null;
+  const latestMs = latest instanceof Date ? latest.getTime() : (latest ? new Date(latest).getTime() : 0);
   return {
     rows,
-    latestSyncMs,
+    latestSyncMs: Number.isFinite(latestMs) ? latestMs : 0,
   };
 }
 
@@ -249,16 +425,12 @@ async function getCachedClickupRow(sfId) {
   if (!key) return null;
   const result = await pool
     .request()
-    .input('sf_id', key)
-    .query(`
-      SELECT TOP 1 row_json, synced_at
-      FROM dbo.clickup_rows
-      WHERE sf_id = @sf_id
-    `);
+    .input('sf_id', getSql().NVarChar(100), key)
+    .query(SELECT_CLICKUP_ROW_SQL);
   const rec = (result.recordset || [])[0];
   if (!rec) return null;
   try {
-    const row = JSON.parse(String(rec.row_json || '{}'));
+    const row = JSON.parse(decodeRowJson(rec.row_json) || '{}');
     if (!row || typeof row !== 'object') return null;
     return {
       row,
@@ -269,25 +441,60 @@ async function getCachedClickupRow(sfId) {
   }
 }
 
+// Content hash of the last synced row set; when a refresh produces the
+// same rows, only the synced_at timestamps need updating.
+let lastSyncHash = '';
+
 async function replaceCachedClickupRows(rows) {
   const pool = await getPool();
   if (!pool) return false;
   const cleaned = Array.isArray(rows) ? rows.filter((r) => r && r.sf_id) : [];
+  const payloads = cleaned.map((row) => JSON.stringify(row));
+  const hasher = require('crypto').createHash('sha1');
+  for (const payload of payloads) hasher.update(payload);
+  const digest = hasher.digest('hex');
+  if (cleaned.length && digest === lastSyncHash) {
+    // Same content as the previous sync: bump the freshness timestamps and
+    // skip shipping the full JSON payload again.
+    await pool.request().query('SET NOCOUNT ON; UPDATE dbo.clickup_rows SET synced_at = SYSUTCDATETIME();');
+    return true;
+  }
+  const sql = getSql();
+  const table = new sql.Table('dbo.clickup_rows');
+  table.create = false;
+  table.columns.add('sf_id', sql.NVarChar(100), { nullable: false });
+  table.columns.add('row_json', sql.NVarChar(sql.MAX), { nullable: false });
+  table.columns.add('source_updated_at', sql.DateTime2, { nullable: true });
+  table.columns.add('synced_at', sql.DateTime2, { nullable: false });
+  const syncedAt = new Date();
+  // source_updated_at strings repeat across rows within a sync; convert
+  // each distinct value once.
+  const sourceDates = new Map();
+  cleaned.forEach((row, i) => {
+    let sourceDate = null;
+    if (row.source_updated_at) {
+      sourceDate = sourceDates.get(row.source_updated_at);
+      if (sourceDate === undefined) {
+        sourceDate = new Date(row.source_updated_at);
+        sourceDates.set(row.source_updated_at, sourceDate);
+      }
+    }
+    table.rows.add(
+      String(row.sf_id),
+      // The content hash stays over the uncompressed JSON above, so the
+      // unchanged-sync fast path is unaffected by compression.
+      encodeRowJson(payloads[i]),
+      sourceDate,
+      syncedAt
+    );
+  });
   const tx = pool.transaction();
   await tx.begin();
   try {
-    await tx.request().query('DELETE FROM dbo.clickup_rows;');
-    for (const row of cleaned) {
-      await tx.request()
-        .input('sf_id', String(row.sf_id))
-        .input('row_json', JSON.stringify(row))
-        .input('source_updated_at', row.source_updated_at ? new Date(row.source_updated_at) : null)
-        .query(`
-          INSERT INTO dbo.clickup_rows (sf_id, row_json, source_updated_at)
-          VALUES (@sf_id, @row_json, @source_updated_at);
-        `);
-    }
+    await tx.request().query(DELETE_CLICKUP_ROWS_SQL);
+    if (table.rows.length) await tx.request().bulk(table);
     await tx.commit();
+    lastSyncHash = digest;
     return true;
   } catch (err) {
     await tx.rollback().catch(() => {});
@@ -300,6 +507,7 @@ module.exports = {
   getOverrides,
   replaceOverrides,
   recordAuditEvent,
+  queueAuditEvent,
   upsertClientLink,
   storageHealth,
   getCachedClickupRows,
@@ -1,37 +1,78 @@
 const crypto = require('crypto');
 
+const DAY_MS = 24 * 60 * 60 * 1000;
+
 function required(name) {
   const value = (process.env[name] || '').trim();
   if (!value) throw new Error(`Missing env var: ${name}`);
   return value;
 }
 
+// The field map is parsed for every task during a sync but only changes
+// when the env var does; key the parsed value on the raw string.
+let fieldMapRaw = null;
+let fieldMapParsed = {};
+
 function parseFieldMap() {
+  const raw = process.env.CLICKUP_FIELD_MAP_JSON || '{}';
+  if (raw === fieldMapRaw) return fieldMapParsed;
   try {
-    const raw = process.env.CLICKUP_FIELD_MAP_JSON || '{}';
     const parsed = JSON.parse(raw);
-    return typeof parsed === 'object' && parsed ? parsed : {};
+    fieldMapParsed = typeof parsed === 'object' && parsed ? parsed : {};
   } catch {
-    return {};
+    fieldMapParsed = {};
   }
+  fieldMapRaw = raw;
+  return fieldMapParsed;
 }
 
+// ClickUp repeats the same millisecond timestamps across tasks in a bulk
+// sync, so cache the formatted dates.
+const DATE_US_CACHE_MAX = 2000;
+const dateUsCache = new Map();
+
 function toDateUS(ms) {
   if (!ms) return '';
   const n = Number(ms);
   if (!Number.isFinite(n)) return '';
+  const cached = dateUsCache.get(n);
+  if (cached !== undefined) return cached;
   const d = new Date(n);
   const mm = String(d.getMonth() + 1).padStart(2, '0');
   const dd = String(d.getDate()).padStart(2, '0');
   const yyyy = d.getFullYear();
-  return `${mm}/${dd}/${yyyy}`;
+  const out = `${mm}/${dd}/${yyyy}`;
+  if (dateUsCache.size >= DATE_US_CACHE_MAX) dateUsCache.clear();
+  dateUsCache.set(n, out);
+  return out;
 }
 
+const US_DATE_CACHE_MAX = 2000;
+const usDateCache = new Map();
+
 function parseUSDate(text) {
   const value = String(text || '').trim();
-  const m = value.match(/^(\d{1,2})\/(\d{1,2})\/(\d{4})$/);
-  if (!m) return null;
-  const dt = new Date(Number(m[3]), Number(m[1]) - 1, Number(m[2]));
+  if (usDateCache.has(value)) return usDateCache.get(value);
+  const parsed = parseUSDateUncached(value);
+  if (usDateCache.size >= US_DATE_CACHE_MAX) usDateCache.clear();
+  usDateCache.set(value, parsed);
+  return parsed;
+}
+
+const DIGITS_ONLY = /^\d+$/;
+
+function parseUSDateUncached(value) {
+  if (value.length < 8) return null;
+  const parts = value.split('/');
+  if (parts.length !== 3 || parts[2].length !== 4) return null;
+  // Digits only: Number() also accepts exponent/hex/signed forms the old
+  // anchored regex rejected, and those must stay invalid.
+  if (!DIGITS_ONLY.test(parts[0]) || !DIGITS_ONLY.test(parts[1]) || !DIGITS_ONLY.test(parts[2])) return null;
+  const month = Number(parts[0]);
+  const day = Number(parts[1]);
+  const year = Number(parts[2]);
+  if (month < 1 || month > 12 || day < 1 || day > 31) return null;
+  const dt = new Date(year, month - 1, day);
   return Number.isNaN(dt.getTime()) ? null : dt;
 }
 
@@ -40,12 +81,15 @@ function dateDiffBusinessDays(start, end) {
   const a = new Date(start.getFullYear(), start.getMonth(), start.getDate());
   const b = new Date(end.getFullYear(), end.getMonth(), end.getDate());
   if (b < a) return null;
-  let count = 0;
-  const cur = new Date(a);
-  while (cur <= b) {
-    const day = cur.getDay();
+  // Count full weeks in closed form; only the remainder (at most six days)
+  // needs a weekday check. Math.round absorbs DST offsets.
+  const totalDays = Math.round((b - a) / DAY_MS) + 1;
+  const fullWeeks = Math.floor(totalDays / 7);
+  let count = fullWeeks * 5;
+  let day = a.getDay();
+  for (let i = fullWeeks * 7; i < totalDays; i += 1) {
     if (day !== 0 && day !== 6) count += 1;
-    cur.setDate(cur.getDate() + 1);
+    day = (day + 1) % 7;
   }
   return count;
 }
@@ -59,9 +103,36 @@ function normalizeText(value) {
   return String(value || '').trim().toLowerCase();
 }
 
+// Signatures are deterministic per (secret, payload), so cache them; the
+// algorithm stays HMAC-SHA256 because issued client links embed these sigs.
+const SIGNATURE_CACHE_MAX = 2000;
+const signatureCache = new Map();
+let signatureSecret = '';
+
 function sign(sfId) {
   const secret = required('CLIENT_LINK_SECRET');
-  return crypto.createHmac('sha256', secret).update(String(sfId)).digest('hex');
+  if (secret !== signatureSecret) {
+    signatureSecret = secret;
+    signatureCache.clear();
+  }
+  const payload = String(sfId);
+  const cached = signatureCache.get(payload);
+  if (cached) return cached;
+  const sig = crypto.createHmac('sha256', secret).update(payload).digest('hex');
+  if (signatureCache.size >= SIGNATURE_CACHE_MAX) signatureCache.clear();
+  signatureCache.set(payload, sig);
+  return sig;
+}
+
+function verifySignature(payload, providedSig) {
+  const provided = String(providedSig || '').trim();
+  if (!provided) return false;
+  const expected = sign(payload);
+  const a = Buffer.from(provided);
+  const b = Buffer.from(expected);
+  // Constant-time comparison so signature checks do not leak match length.
+  if (a.length !== b.length) return false;
+  return crypto.timingSafeEqual(a, b);
 }
 
 function readHeader(headers, key) {
@@ -145,5 +216,6 @@ module.exports = {
   quarterLabel,
   normalizeText,
   sign,
+  verifySignature,
   isAdmin,
 };
@@ -41,3 +41,20 @@ BEGIN
 END;
 GO
 
+
+IF OBJECT_ID(N'dbo.clickup_rows', N'U') IS NULL
+BEGIN
+  CREATE TABLE dbo.clickup_rows (
+    sf_id NVARCHAR(100) NOT NULL PRIMARY KEY,
+    row_json NVARCHAR(MAX) NOT NULL,
+    source_updated_at DATETIME2 NULL,
+    synced_at DATETIME2 NOT NULL CONSTRAINT DF_clickup_rows_synced_at DEFAULT SYSUTCDATETIME()
+  );
+END;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = N'IX_clickup_rows_synced_at' AND object_id = OBJECT_ID(N'dbo.clickup_rows'))
+BEGIN
+  CREATE INDEX IX_clickup_rows_synced_at ON dbo.clickup_rows (synced_at DESC);
+END;
+GO
@@ -1,11 +1,12 @@
+const crypto = require('crypto');
 const { app } = require('@azure/functions');
 const { fetchListRows, updateCustomField } = require('../shared/clickup');
-const { isAdmin, sign, parseUSDate, dateDiffBusinessDays, quarterLabel, parseFieldMap } = require('../shared/utils');
+const { isAdmin, sign, verifySignature, parseUSDate, dateDiffBusinessDays, quarterLabel, parseFieldMap } = require('../shared/utils');
 const {
   hasSqlConfig,
   getOverrides,
   replaceOverrides,
-  recordAuditEvent,
+  queueAuditEvent,
   upsertClientLink,
   storageHealth,
   getCachedClickupRow,
@@ -17,53 +18,85 @@ function json(status, body) {
   return { status, jsonBody: body, headers: { 'Content-Type': 'application/json' } };
 }
 
-function getMetric(metrics, ...keys) {
-  for (const key of keys) {
-    const value = String(metrics[key] || '').trim();
-    if (value) return value;
+// Conditional responses: hash the serialized payload and honor If-None-Match
+// so unchanged dashboards cost a 304 instead of a full body transfer.
+function jsonConditional(req, body) {
+  const serialized = JSON.stringify(body);
+  const etag = `"${crypto.createHash('sha1').update(serialized).digest('hex')}"`;
+  const ifNoneMatch = String(req.headers?.get?.('if-none-match') || '').trim();
+  if (ifNoneMatch && ifNoneMatch === etag) {
+    return { status: 304, headers: { ETag: etag } };
   }
-  return '';
+  return {
+    status: 200,
+    body: serialized,
+    headers: { 'Content-Type': 'application/json', ETag: etag },
+  };
+}
+
+// Fixed arity (at most two fallback keys are ever used) so hot per-row
+// callers skip the rest-parameter array allocation.
+function getMetric(metrics, key, fallbackKey, fallbackKey2) {
+  let value = String(metrics[key] || '').trim();
+  if (!value && fallbackKey) value = String(metrics[fallbackKey] || '').trim();
+  if (!value && fallbackKey2) value = String(metrics[fallbackKey2] || '').trim();
+  return value;
 }
 
+const MONTH_NAMES = [
+  'January', 'February', 'March', 'April', 'May', 'June',
+  'July', 'August', 'September', 'October', 'November', 'December',
+];
+
+// Hot-path regexes hoisted so per-call literals are not re-created.
+const US_DATE_RE = /^(\d{2})\/(\d{2})\/(\d{4})$/;
+const ISO_MONTH_RE = /^(\d{4})-(\d{2})(?:-\d{2})?$/;
+const MONTH_YEAR_RE = /^([A-Za-z]+)\s*[-,\/]?\s*(\d{4})$/;
+const ANY_US_DATE_RE = /(\d{1,2})\/(\d{1,2})\/(\d{2,4})/;
+const QUARTER_HEADER_RE = /^Q([1-4])\s+(\d{4})$/i;
+const QUARTER_LABEL_RE = /^(\d{4}) Q([1-4])$/;
+const SIGNED_INT_RE = /-?\d+/;
+
 function normalizeWorkMonth(value) {
   const raw = String(value || '').trim();
   if (!raw) return '';
-  const mUs = raw.match(/^(\d{2})\/(\d{2})\/(\d{4})$/);
+  const mUs = raw.match(US_DATE_RE);
   if (mUs) {
     const dt = new Date(Number(mUs[3]), Number(mUs[1]) - 1, Number(mUs[2]));
-    return dt.toLocaleString('en-US', { month: 'long' });
+    return MONTH_NAMES[dt.getMonth()];
   }
-  const mIso = raw.match(/^(\d{4})-(\d{2})(?:-\d{2})?$/);
+  const mIso = raw.match(ISO_MONTH_RE);
   if (mIso) {
     const dt = new Date(Number(mIso[1]), Number(mIso[2]) - 1, 1);
-    return dt.toLocaleString('en-US', { month: 'long' });
+    return MONTH_NAMES[dt.getMonth()];
   }
   const fromDateCtor = new Date(raw);
   if (!Number.isNaN(fromDateCtor.getTime())) {
-    return fromDateCtor.toLocaleString('en-US', { month: 'long' });
+    return MONTH_NAMES[fromDateCtor.getMonth()];
   }
-  const mMonthYear = raw.match(/^([A-Za-z]+)\s*[-,\/]?\s*(\d{4})$/);
+  const mMonthYear = raw.match(MONTH_YEAR_RE);
   if (mMonthYear) {
     const month = mMonthYear[1].toLowerCase();
-    const monthMap = {
-      jan: 'January', january: 'January',
-      feb: 'February', february: 'February',
-      mar: 'March', march: 'March',
-      apr: 'April', april: 'April',
-      may: 'May',
-      jun: 'June', june: 'June',
-      jul: 'July', july: 'July',
-      aug: 'August', august: 'August',
-      sep: 'September', sept: 'September', september: 'September',
-      oct: 'October', october: 'October',
-      nov: 'November', november: 'November',
-      dec: 'December', december: 'December',
-    };
-    if (monthMap[month]) return monthMap[month];
+    if (MONTH_NAME_MAP[month]) return MONTH_NAME_MAP[month];
   }
   return raw;
 }
 
+const MONTH_NAME_MAP = {
+  jan: 'January', january: 'January',
+  feb: 'February', february: 'February',
+  mar: 'March', march: 'March',
+  apr: 'April', april: 'April',
+  may: 'May',
+  jun: 'June', june: 'June',
+  jul: 'July', july: 'July',
+  aug: 'August', august: 'August',
+  sep: 'September', sept: 'September', september: 'September',
+  oct: 'October', october: 'October',
+  nov: 'November', november: 'November',
+  dec: 'December', december: 'December',
+};
+
 function getClientBaseUrl() {
   const raw = String(process.env.CLIENT_PUBLIC_BASE_URL || '').trim();
   if (!raw) return '';
@@ -118,10 +151,26 @@ function resolveAssessorAccess(token) {
   return null;
 }
 
+// The assessors handler signs the same lead names on every load; the
+// underlying sign() is cached, so this just skips re-normalizing.
+const ASSESSOR_SIG_CACHE_MAX = 500;
+const assessorSigCache = new Map();
+let assessorSigSecret = '';
+
 function signAssessorLead(lead) {
-  const normalized = normalizeLead(lead);
-  if (!normalized) return '';
-  return sign(`assessor:${normalized}`);
+  const secret = (process.env.CLIENT_LINK_SECRET || '').trim();
+  if (secret !== assessorSigSecret) {
+    assessorSigSecret = secret;
+    assessorSigCache.clear();
+  }
+  const key = String(lead || '');
+  const cached = assessorSigCache.get(key);
+  if (cached !== undefined) return cached;
+  const normalized = normalizeLead(key);
+  const sig = normalized ? sign(`assessor:${normalized}`) : '';
+  if (assessorSigCache.size >= ASSESSOR_SIG_CACHE_MAX) assessorSigCache.clear();
+  assessorSigCache.set(key, sig);
+  return sig;
 }
 
 function resolveAssessorAccessFromLead(lead, sig) {
@@ -129,8 +178,7 @@ function resolveAssessorAccessFromLead(lead, sig) {
   const providedSig = String(sig || '').trim();
   const normalized = normalizeLead(rawLead);
   if (!rawLead || !providedSig || !normalized) return null;
-  const expected = signAssessorLead(rawLead);
-  if (!expected || providedSig !== expected) return null;
+  if (!verifySignature(`assessor:${normalized}`, providedSig)) return null;
   return {
     assessor_name: rawLead,
     lead_values: [rawLead],
@@ -192,23 +240,37 @@ function resolveFieldId(fieldMap, metricKey) {
   return null;
 }
 
+const TITLE_CASE_CACHE_MAX = 2000;
+const titleCaseCache = new Map();
+
 function titleCase(value) {
-  return String(value || '')
+  const key = String(value || '');
+  const cached = titleCaseCache.get(key);
+  if (cached !== undefined) return cached;
+  const result = titleCaseUncached(key);
+  if (titleCaseCache.size >= TITLE_CASE_CACHE_MAX) titleCaseCache.clear();
+  titleCaseCache.set(key, result);
+  return result;
+}
+
+const ACRONYM_PATTERN = /\b(Sra|Nva|Baa|Acd|Ecd)\b/g;
+const ACRONYM_MAP = { Sra: 'SRA', Nva: 'NVA', Baa: 'BAA', Acd: 'ACD', Ecd: 'ECD' };
+
+function titleCaseUncached(value) {
+  return value
     .replace(/[_-]/g, ' ')
     .split(' ')
     .filter(Boolean)
     .map((s) => s.charAt(0).toUpperCase() + s.slice(1).toLowerCase())
     .join(' ')
-    .replace(/Sra/g, 'SRA')
-    .replace(/Nva/g, 'NVA')
-    .replace(/Baa/g, 'BAA')
-    .replace(/Acd/g, 'ACD')
-    .replace(/Ecd/g, 'ECD');
+    .replace(ACRONYM_PATTERN, (m) => ACRONYM_MAP[m]);
 }
 
+const TRUE_VALUES = new Set(['true', '1', 'yes']);
+const FALSE_VALUES = new Set(['false', '0', 'no']);
+
 function parseBool(v) {
-  const t = String(v || '').trim().toLowerCase();
-  return t === 'true' || t === '1' || t === 'yes';
+  return TRUE_VALUES.has(String(v || '').trim().toLowerCase());
 }
 
 function statusClass(status) {
@@ -219,42 +281,81 @@ function statusClass(status) {
   return 'status-pill-neutral';
 }
 
-function computeStepStatus(step) {
+function startOfToday() {
+  const now = new Date();
+  return new Date(now.getFullYear(), now.getMonth(), now.getDate());
+}
+
+// Status depends only on ECD/ACD/kickoff and the current day, so results
+// are cached and the cache dropped whenever the day rolls over.
+const STEP_STATUS_CACHE_MAX = 2000;
+const stepStatusCache = new Map();
+let stepStatusCacheDayMs = 0;
+
+function computeStepStatus(step, today = null) {
+  const todayStart = today || startOfToday();
+  const dayMs = todayStart.getTime();
+  if (dayMs !== stepStatusCacheDayMs) {
+    stepStatusCacheDayMs = dayMs;
+    stepStatusCache.clear();
+  }
+  const key = `${step.ECD || ''}|${step.ACD || ''}|${step.isKickoff ? 1 : 0}`;
+  const cached = stepStatusCache.get(key);
+  if (cached !== undefined) return cached;
+  const status = computeStepStatusUncached(step, todayStart);
+  if (stepStatusCache.size >= STEP_STATUS_CACHE_MAX) stepStatusCache.clear();
+  stepStatusCache.set(key, status);
+  return status;
+}
+
+function computeStepStatusUncached(step, todayStart) {
   if (step.ACD) return step.isKickoff ? 'Completed' : 'On Track';
   if (step.isKickoff) return 'Not Started';
   if (!step.ECD) return 'Not Started';
 
   const ecd = parseUSDate(step.ECD);
   if (!ecd) return 'Not Started';
-  const now = new Date();
-  const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
   const ecdDate = new Date(ecd.getFullYear(), ecd.getMonth(), ecd.getDate());
-  const diffMs = ecdDate.getTime() - today.getTime();
-  const diffDays = Math.ceil(diffMs / 86400000);
+  const diffMs = ecdDate.getTime() - todayStart.getTime();
+  const diffDays = Math.ceil(diffMs / DAY_MS);
   if (diffDays < 0) return 'Roadblock/Overage';
   if (diffDays <= 3) return 'Potential Roadblock';
   return 'On Track';
 }
 
+// Every step renders two input values per dashboard build, and the same
+// date strings recur across rows; cache the conversions.
+const INPUT_DATE_CACHE_MAX = 2000;
+const inputDateCache = new Map();
+
 function toInputDate(dateUS) {
-  const m = String(dateUS || '').trim().match(/^(\d{2})\/(\d{2})\/(\d{4})$/);
-  if (!m) return '';
-  return `${m[3]}-${m[1]}-${m[2]}`;
+  const key = String(dateUS || '').trim();
+  const cached = inputDateCache.get(key);
+  if (cached !== undefined) return cached;
+  const m = key.match(US_DATE_RE);
+  const result = m ? `${m[3]}-${m[1]}-${m[2]}` : '';
+  if (inputDateCache.size >= INPUT_DATE_CACHE_MAX) inputDateCache.clear();
+  inputDateCache.set(key, result);
+  return result;
 }
 
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+// Weekend shift offsets indexed by getDay(): Sunday=0 ... Saturday=6.
+const SHIFT_TO_MONDAY_DAYS = [1, 0, 0, 0, 0, 0, 2];
+const SHIFT_TO_FRIDAY_DAYS = [-2, 0, 0, 0, 0, 0, -1];
+
 function shiftToMondayIfWeekend(d) {
   const out = new Date(d.getFullYear(), d.getMonth(), d.getDate());
-  const wd = out.getDay();
-  if (wd === 6) out.setDate(out.getDate() + 2);
-  if (wd === 0) out.setDate(out.getDate() + 1);
+  const shift = SHIFT_TO_MONDAY_DAYS[out.getDay()];
+  if (shift) out.setDate(out.getDate() + shift);
   return out;
 }
 
 function shiftToFridayIfWeekend(d) {
   const out = new Date(d.getFullYear(), d.getMonth(), d.getDate());
-  const wd = out.getDay();
-  if (wd === 6) out.setDate(out.getDate() - 1);
-  if (wd === 0) out.setDate(out.getDate() - 2);
+  const shift = SHIFT_TO_FRIDAY_DAYS[out.getDay()];
+  if (shift) out.setDate(out.getDate() + shift);
   return out;
 }
 
@@ -273,22 +374,26 @@ function addDays(d, days) {
 function diffCalendarDays(a, b) {
   const aa = new Date(a.getFullYear(), a.getMonth(), a.getDate());
   const bb = new Date(b.getFullYear(), b.getMonth(), b.getDate());
-  return Math.round((aa.getTime() - bb.getTime()) / 86400000);
+  return Math.round((aa.getTime() - bb.getTime()) / DAY_MS);
 }
 
+const YMD_DIGITS_ONLY = /^\d+$/;
+
 function toClickupMsFromYmd(ymd) {
   if (!ymd) return null;
-  const m = String(ymd).match(/^(\d{4})-(\d{2})-(\d{2})$/);
-  if (!m) return null;
-  const dt = new Date(Number(m[1]), Number(m[2]) - 1, Number(m[3]), 12, 0, 0, 0);
+  const parts = String(ymd).split('-');
+  if (parts.length !== 3 || parts[0].length !== 4 || parts[1].length !== 2 || parts[2].length !== 2) return null;
+  // Digits only; Number() would also accept exponent/hex/signed forms.
+  if (!YMD_DIGITS_ONLY.test(parts[0]) || !YMD_DIGITS_ONLY.test(parts[1]) || !YMD_DIGITS_ONLY.test(parts[2])) return null;
+  const year = Number(parts[0]);
+  const month = Number(parts[1]);
+  const day = Number(parts[2]);
+  const dt = new Date(year, month - 1, day, 12, 0, 0, 0);
   return dt.getTime();
 }
 
-function toClickupMsFromUs(us) {
-  const dt = parseAnyUSDate(us);
-  if (!dt) return null;
-  const atNoon = new Date(dt.getFullYear(), dt.getMonth(), dt.getDate(), 12, 0, 0, 0);
-  return atNoon.getTime();
+function toClickupMsFromDate(d) {
+  return new Date(d.getFullYear(), d.getMonth(), d.getDate(), 12, 0, 0, 0).getTime();
 }
 
 function parseMetricDate(v) {
@@ -297,42 +402,66 @@ function parseMetricDate(v) {
   return new Date(dt.getFullYear(), dt.getMonth(), dt.getDate());
 }
 
-function findStepNameBySlug(stepMap, slug) {
-  return Object.keys(stepMap).find((name) => String(stepMap[name]?.step_slug || '') === slug) || null;
+// Slugs never change after buildDashboard assembles the step map, so one
+// reverse index replaces the per-rule linear scans over step names.
+function buildSlugIndex(stepMap) {
+  const bySlug = new Map();
+  for (const name of Object.keys(stepMap)) {
+    const slug = String(stepMap[name]?.step_slug || '');
+    if (slug && !bySlug.has(slug)) bySlug.set(slug, name);
+  }
+  return bySlug;
 }
 
-function anchorDateForSlug(stepMap, slug) {
-  const name = findStepNameBySlug(stepMap, slug);
-  if (!name) return null;
-  const step = stepMap[name] || {};
-  return parseMetricDate(step.ACD) || parseMetricDate(step.ECD);
+// `anchors` caches resolved anchor dates per slug for the duration of one
+// rule pass; writes through setEcd* evict the touched slug so later rules
+// never see a stale anchor.
+function anchorDateForSlug(stepMap, bySlug, slug, anchors) {
+  if (anchors && anchors.has(slug)) return anchors.get(slug);
+  const name = bySlug.get(slug);
+  let anchor = null;
+  if (name) {
+    const step = stepMap[name] || {};
+    anchor = parseMetricDate(step.ACD) || parseMetricDate(step.ECD);
+  }
+  if (anchors) anchors.set(slug, anchor);
+  return anchor;
 }
 
-function setEcdFromDateIfBlank(stepMap, slug, anchorDate, days) {
-  const name = findStepNameBySlug(stepMap, slug);
+function setEcdFromDateIfBlank(stepMap, bySlug, slug, anchorDate, days, anchors) {
+  const name = bySlug.get(slug);
   if (!name || !anchorDate) return;
   const step = stepMap[name];
   if (String(step.ECD || '').trim()) return;
   const candidate = shiftToMondayIfWeekend(addDays(anchorDate, days));
   step.ECD = formatUSDate(candidate);
+  if (anchors) anchors.delete(slug);
 }
 
-function setEcdIfBlank(stepMap, slug, anchorSlug, days) {
-  const anchor = anchorDateForSlug(stepMap, anchorSlug);
-  setEcdFromDateIfBlank(stepMap, slug, anchor, days);
+function setEcdIfBlank(stepMap, bySlug, slug, anchorSlug, days, anchors) {
+  const anchor = anchorDateForSlug(stepMap, bySlug, anchorSlug, anchors);
+  setEcdFromDateIfBlank(stepMap, bySlug, slug, anchor, days, anchors);
 }
 
 function shiftBusinessSafe(value, deltaDays) {
-  const shifted = addDays(value, deltaDays);
-  if (deltaDays < 0) return shiftToFridayIfWeekend(shifted);
-  return shiftToMondayIfWeekend(shifted);
+  // Fold the day offset and the weekend adjustment into one Date each; the
+  // constructor normalizes out-of-range day values.
+  const shifted = new Date(value.getFullYear(), value.getMonth(), value.getDate() + deltaDays);
+  const table = deltaDays < 0 ? SHIFT_TO_FRIDAY_DAYS : SHIFT_TO_MONDAY_DAYS;
+  const adjust = table[shifted.getDay()];
+  if (!adjust) return shifted;
+  return new Date(shifted.getFullYear(), shifted.getMonth(), shifted.getDate() + adjust);
 }
 
 function addEcdAcdFields(stepMap, offsets) {
-  const fieldMap = parseFieldMap();
+  // Disabled tracks and rows without step metrics produce empty maps; skip
+  // the whole rule pass for them.
+  if (!Object.keys(stepMap).length) return;
+  const bySlug = buildSlugIndex(stepMap);
+  const anchors = new Map();
   const kickoffName = Object.keys(stepMap).find((n) => String(stepMap[n]?.step_slug || '').includes('kickoff')) || null;
   const kickoffSlug = kickoffName ? String(stepMap[kickoffName]?.step_slug || '') : '';
-  const sraKickoffName = findStepNameBySlug(stepMap, 'sra_kickoff');
+  const sraKickoffName = bySlug.get('sra_kickoff');
   if (sraKickoffName) {
     const kickoff = stepMap[sraKickoffName];
     // Only SRA kickoff mirrors ECD from ACD.
@@ -341,31 +470,31 @@ function addEcdAcdFields(stepMap, offsets) {
   }
 
   // SRA explicit rules
-  setEcdIfBlank(stepMap, 'receive_policies_and_procedures_baa', 'sra_kickoff', 7);
-  setEcdIfBlank(stepMap, 'review_policies_and_procedures_baa', 'receive_policies_and_procedures_baa', 12);
-  setEcdIfBlank(stepMap, 'schedule_onsite_remote_interview', 'sra_kickoff', 14);
+  setEcdIfBlank(stepMap, bySlug, 'receive_policies_and_procedures_baa', 'sra_kickoff', 7, anchors);
+  setEcdIfBlank(stepMap, bySlug, 'review_policies_and_procedures_baa', 'receive_policies_and_procedures_baa', 12, anchors);
+  setEcdIfBlank(stepMap, bySlug, 'schedule_onsite_remote_interview', 'sra_kickoff', 14, anchors);
 
-  const goName = findStepNameBySlug(stepMap, 'go_onsite_have_interview');
+  const goName = bySlug.get('go_onsite_have_interview');
   if (goName) {
     const goStep = stepMap[goName];
     const goAcd = parseMetricDate(goStep.ACD);
     if (goAcd) goStep.ECD = formatUSDate(goAcd);
-    else setEcdIfBlank(stepMap, 'go_onsite_have_interview', 'review_policies_and_procedures_baa', 7);
+    else setEcdIfBlank(stepMap, bySlug, 'go_onsite_have_interview', 'review_policies_and_procedures_baa', 7, anchors);
   }
 
-  setEcdIfBlank(stepMap, 'recieve_requested_follow_up_documentation', 'go_onsite_have_interview', 7);
+  setEcdIfBlank(stepMap, bySlug, 'recieve_requested_follow_up_documentation', 'go_onsite_have_interview', 7, anchors);
 
-  const reviewName = findStepNameBySlug(stepMap, 'review_sra');
+  const reviewName = bySlug.get('review_sra');
   if (reviewName) {
     const review = stepMap[reviewName];
     if (!String(review.ECD || '').trim()) {
-      const presentName = findStepNameBySlug(stepMap, 'present_final_sra_report');
+      const presentName = bySlug.get('present_final_sra_report');
       const presentAcd = presentName ? parseMetricDate(stepMap[presentName]?.ACD) : null;
       if (presentAcd) {
         review.ECD = formatUSDate(shiftToFridayIfWeekend(addDays(presentAcd, -7)));
       } else {
-        const receiveAnchor = anchorDateForSlug(stepMap, 'recieve_requested_follow_up_documentation')
-          || anchorDateForSlug(stepMap, 'go_onsite_have_interview');
+        const receiveAnchor = anchorDateForSlug(stepMap, bySlug, 'recieve_requested_follow_up_documentation', anchors)
+          || anchorDateForSlug(stepMap, bySlug, 'go_onsite_have_interview', anchors);
         if (receiveAnchor) {
           review.ECD = formatUSDate(shiftToMondayIfWeekend(addDays(receiveAnchor, 7)));
         }
@@ -373,26 +502,26 @@ function addEcdAcdFields(stepMap, offsets) {
     }
   }
 
-  const scheduleFinalSraName = findStepNameBySlug(stepMap, 'schedule_final_sra_report');
+  // Review ECD is settled above, so its anchor can be shared by the
+  // schedule/present fallbacks below.
+  const reviewAnchor = anchorDateForSlug(stepMap, bySlug, 'review_sra', anchors);
+
+  const scheduleFinalSraName = bySlug.get('schedule_final_sra_report');
   if (scheduleFinalSraName) {
     const scheduleFinal = stepMap[scheduleFinalSraName];
-    if (!String(scheduleFinal.ECD || '').trim()) {
-      const reviewAnchor = anchorDateForSlug(stepMap, 'review_sra');
-      if (reviewAnchor) {
-        scheduleFinal.ECD = formatUSDate(reviewAnchor);
-      }
+    if (!String(scheduleFinal.ECD || '').trim() && reviewAnchor) {
+      scheduleFinal.ECD = formatUSDate(reviewAnchor);
     }
   }
 
-  const presentSraName = findStepNameBySlug(stepMap, 'present_final_sra_report');
+  const presentSraName = bySlug.get('present_final_sra_report');
   if (presentSraName) {
     const present = stepMap[presentSraName];
     if (!String(present.ECD || '').trim()) {
       const presentAcd = parseMetricDate(present.ACD);
       if (presentAcd) present.ECD = formatUSDate(presentAcd);
       else {
-        const scheduleAnchor = anchorDateForSlug(stepMap, 'schedule_final_sra_report')
-          || anchorDateForSlug(stepMap, 'review_sra');
+        const scheduleAnchor = anchorDateForSlug(stepMap, bySlug, 'schedule_final_sra_report', anchors) || reviewAnchor;
         if (scheduleAnchor) {
           present.ECD = formatUSDate(shiftToMondayIfWeekend(addDays(scheduleAnchor, 7)));
         }
@@ -401,84 +530,73 @@ function addEcdAcdFields(stepMap, offsets) {
   }
 
   // NVA explicit rules
-  setEcdIfBlank(stepMap, 'receive_credentials', 'nva_kickoff', 7);
-  setEcdIfBlank(stepMap, 'verify_access', 'receive_credentials', 7);
+  setEcdIfBlank(stepMap, bySlug, 'receive_credentials', 'nva_kickoff', 7, anchors);
+  setEcdIfBlank(stepMap, bySlug, 'verify_access', 'receive_credentials', 7, anchors);
 
-  const scansName = findStepNameBySlug(stepMap, 'scans_complete');
-  if (scansName) {
-    const scans = stepMap[scansName];
+  const scansName = bySlug.get('scans_complete');
+  const scans = scansName ? stepMap[scansName] : null;
+  if (scans) {
     if (!String(scans.ECD || '').trim()) {
-      const receiveName = findStepNameBySlug(stepMap, 'receive_credentials');
-      const verifyName = findStepNameBySlug(stepMap, 'verify_access');
+      const receiveName = bySlug.get('receive_credentials');
+      const verifyName = bySlug.get('verify_access');
       const receiveAcd = receiveName ? parseMetricDate(stepMap[receiveName]?.ACD) : null;
       const verifyAcd = verifyName ? parseMetricDate(stepMap[verifyName]?.ACD) : null;
       if (!receiveAcd || !verifyAcd) {
-        const kickoffAnchor = anchorDateForSlug(stepMap, 'nva_kickoff');
-        setEcdFromDateIfBlank(stepMap, 'scans_complete', kickoffAnchor, 28);
+        const kickoffAnchor = anchorDateForSlug(stepMap, bySlug, 'nva_kickoff', anchors);
+        setEcdFromDateIfBlank(stepMap, bySlug, 'scans_complete', kickoffAnchor, 28, anchors);
       } else {
         const maxAcd = receiveAcd > verifyAcd ? receiveAcd : verifyAcd;
-        setEcdFromDateIfBlank(stepMap, 'scans_complete', maxAcd, 21);
+        setEcdFromDateIfBlank(stepMap, bySlug, 'scans_complete', maxAcd, 21, anchors);
       }
     }
   }
 
-  const scansEcd = parseMetricDate(stepMap[scansName]?.ECD);
-  const scansAcd = parseMetricDate(stepMap[scansName]?.ACD);
-  const presentNvaName = findStepNameBySlug(stepMap, 'present_final_nva_report');
+  const scansEcd = scans ? parseMetricDate(scans.ECD) : null;
+  const scansAcd = scans ? parseMetricDate(scans.ACD) : null;
+  const presentNvaName = bySlug.get('present_final_nva_report');
   const presentNvaAcd = presentNvaName ? parseMetricDate(stepMap[presentNvaName]?.ACD) : null;
 
-  const compileName = findStepNameBySlug(stepMap, 'compile_report');
+  // compile_report and access_removed share this derived date.
+  const dayBeforePresentNva = presentNvaAcd ? formatUSDate(shiftToFridayIfWeekend(addDays(presentNvaAcd, -1))) : '';
+
+  const compileName = bySlug.get('compile_report');
   if (compileName) {
-    if (presentNvaAcd) stepMap[compileName].ECD = formatUSDate(shiftToFridayIfWeekend(addDays(presentNvaAcd, -1)));
-    else setEcdFromDateIfBlank(stepMap, 'compile_report', scansEcd, 7);
+    if (presentNvaAcd) stepMap[compileName].ECD = dayBeforePresentNva;
+    else setEcdFromDateIfBlank(stepMap, bySlug, 'compile_report', scansEcd, 7, anchors);
   }
 
-  const accessName = findStepNameBySlug(stepMap, 'access_removed');
+  const accessName = bySlug.get('access_removed');
   if (accessName) {
-    if (presentNvaAcd) stepMap[accessName].ECD = formatUSDate(shiftToFridayIfWeekend(addDays(presentNvaAcd, -1)));
-    else setEcdFromDateIfBlank(stepMap, 'access_removed', scansEcd, 5);
+    if (presentNvaAcd) stepMap[accessName].ECD = dayBeforePresentNva;
+    else setEcdFromDateIfBlank(stepMap, bySlug, 'access_removed', scansEcd, 5, anchors);
   }
 
-  const scheduleNvaName = findStepNameBySlug(stepMap, 'schedule_final_nva_report');
+  const scheduleNvaName = bySlug.get('schedule_final_nva_report');
   if (scheduleNvaName) {
-    if (scansAcd) setEcdFromDateIfBlank(stepMap, 'schedule_final_nva_report', scansAcd, 21);
-    else setEcdFromDateIfBlank(stepMap, 'schedule_final_nva_report', scansEcd, 12);
+    if (scansAcd) setEcdFromDateIfBlank(stepMap, bySlug, 'schedule_final_nva_report', scansAcd, 21, anchors);
+    else setEcdFromDateIfBlank(stepMap, bySlug, 'schedule_final_nva_report', scansEcd, 12, anchors);
   }
 
   if (presentNvaName) {
     if (presentNvaAcd) stepMap[presentNvaName].ECD = formatUSDate(presentNvaAcd);
-    else setEcdFromDateIfBlank(stepMap, 'present_final_nva_report', scansEcd, 19);
+    else setEcdFromDateIfBlank(stepMap, bySlug, 'present_final_nva_report', scansEcd, 19, anchors);
   }
 
-  // Fallback offset rules.
-  const explicit = new Set([
-    'receive_policies_and_procedures_baa',
-    'review_policies_and_procedures_baa',
-    'schedule_onsite_remote_interview',
-    'go_onsite_have_interview',
-    'recieve_requested_follow_up_documentation',
-    'review_sra',
-    'schedule_final_sra_report',
-    'present_final_sra_report',
-    'sra_kickoff',
-    'receive_credentials',
-    'verify_access',
-    'scans_complete',
-    'access_removed',
-    'compile_report',
-    'schedule_final_nva_report',
-    'present_final_nva_report',
-    'nva_kickoff',
-  ]);
-  for (const [slug, offset] of Object.entries(offsets || {})) {
-    if (explicit.has(slug)) continue;
-    if (kickoffSlug) setEcdIfBlank(stepMap, slug, kickoffSlug, offset);
+  // Fallback offset rules. Every fallback anchors on the kickoff step, so
+  // resolve that date once instead of per slug.
+  const kickoffAnchor = kickoffSlug ? anchorDateForSlug(stepMap, bySlug, kickoffSlug, anchors) : null;
+  if (kickoffAnchor) {
+    for (const [slug, offset] of Object.entries(offsets || {})) {
+      if (EXPLICIT_RULE_SLUGS.has(slug)) continue;
+      setEcdFromDateIfBlank(stepMap, bySlug, slug, kickoffAnchor, offset, anchors);
+    }
   }
 
   // Status + data bindings
+  const today = startOfToday();
   for (const step of Object.values(stepMap)) {
     step.isKickoff = String(step.step_slug || '').includes('kickoff');
-    step.status = computeStepStatus(step);
+    step.status = computeStepStatus(step, today);
     step.status_class = statusClass(step.status);
     step.ecd.value = step.ECD || 'Not set';
     step.acd.value = step.ACD || 'Not set';
@@ -491,10 +609,21 @@ function addEcdAcdFields(stepMap, offsets) {
   }
 }
 
+const ANY_US_DATE_CACHE_MAX = 2000;
+const anyUsDateCache = new Map();
+
 function parseAnyUSDate(value) {
   const text = String(value || '').trim();
   if (!text) return null;
-  const m = text.match(/(\d{1,2})\/(\d{1,2})\/(\d{2,4})/);
+  if (anyUsDateCache.has(text)) return anyUsDateCache.get(text);
+  const parsed = parseAnyUSDateUncached(text);
+  if (anyUsDateCache.size >= ANY_US_DATE_CACHE_MAX) anyUsDateCache.clear();
+  anyUsDateCache.set(text, parsed);
+  return parsed;
+}
+
+function parseAnyUSDateUncached(text) {
+  const m = text.match(ANY_US_DATE_RE);
   if (!m) return null;
   let year = Number(m[3]);
   if (year < 100) year += year >= 70 ? 1900 : 2000;
@@ -511,11 +640,6 @@ function formatUSDate(d) {
   return `${mm}/${dd}/${yyyy}`;
 }
 
-function quarterFromDate(d) {
-  const q = Math.floor(d.getMonth() / 3) + 1;
-  return `${d.getFullYear()} Q${q}`;
-}
-
 function normalizeCompanyName(value) {
   return String(value || '')
     .toLowerCase()
@@ -525,56 +649,93 @@ function normalizeCompanyName(value) {
     .trim();
 }
 
+// Dedup keys and coverage sets for the historical rows, built once per CSV
+// snapshot and keyed on the rows array identity (a reload swaps in a new
+// array via loadHistoricalRows).
+let historicalIndexRows = null;
+let historicalIndexValue = null;
+
+function historicalIndex(items) {
+  if (items === historicalIndexRows && historicalIndexValue) return historicalIndexValue;
+  const keys = new Set();
+  const companies = new Set();
+  const sfIds = new Set();
+  for (const r of items) {
+    const key = closeRowKey(r);
+    keys.add(key);
+    const company = key.slice(0, key.indexOf('|'));
+    if (company) companies.add(company);
+    const sf = String(r.sf_id || '').trim();
+    if (sf) sfIds.add(sf);
+  }
+  historicalIndexRows = items;
+  historicalIndexValue = { keys, companies, sfIds };
+  return historicalIndexValue;
+}
+
+// Dedup identity for a close-out row; shared by the historical key set and
+// the live-row filter in the metrics handler.
+function closeRowKey(row) {
+  return `${normalizeCompanyName(row.company)}|${String(row.track || '').toUpperCase()}|${String(row.kickoff_date || '').trim()}|${String(row.final_date || '').trim()}`;
+}
+
 function parseCsvRows(text) {
   const rows = [];
   let row = [];
   let cell = '';
+  // Plain characters are taken as slices between delimiters instead of
+  // appending one character at a time.
+  let cellStart = 0;
   let inQuotes = false;
 
   for (let i = 0; i < text.length; i += 1) {
     const ch = text[i];
     if (ch === '"') {
+      cell += text.slice(cellStart, i);
       if (inQuotes && text[i + 1] === '"') {
         cell += '"';
         i += 1;
       } else {
         inQuotes = !inQuotes;
       }
+      cellStart = i + 1;
     } else if (ch === ',' && !inQuotes) {
-      row.push(cell);
+      row.push(cell + text.slice(cellStart, i));
       cell = '';
+      cellStart = i + 1;
     } else if ((ch === '\n' || ch === '\r') && !inQuotes) {
+      row.push(cell + text.slice(cellStart, i));
       if (ch === '\r' && text[i + 1] === '\n') i += 1;
-      row.push(cell);
       cell = '';
+      cellStart = i + 1;
       rows.push(row);
       row = [];
-    } else {
-      cell += ch;
     }
   }
-  if (cell.length || row.length) {
-    row.push(cell);
+  const tail = cell + text.slice(cellStart);
+  if (tail.length || row.length) {
+    row.push(tail);
     rows.push(row);
   }
   return rows;
 }
 
 function normalizeHeader(h) {
-  return String(h || '')
-    .replace(/\r/g, ' ')
-    .replace(/\n/g, ' ')
-    .trim()
-    .toLowerCase()
-    .replace(/\s+/g, ' ');
+  // One whitespace-collapsing pass also covers the CR/LF replacements.
+  return String(h || '').replace(/\s+/g, ' ').trim().toLowerCase();
 }
 
 let historicalCache = null;
 let historicalCacheMtime = 0;
 function loadHistoricalRows() {
   const csvPath = path.join(__dirname, '..', 'data', 'closed-projects.csv');
-  if (!fs.existsSync(csvPath)) return [];
-  const stat = fs.statSync(csvPath);
+  let stat;
+  try {
+    // One stat call doubles as the existence check.
+    stat = fs.statSync(csvPath);
+  } catch (_) {
+    return [];
+  }
   if (historicalCache && historicalCacheMtime === stat.mtimeMs) return historicalCache;
 
   const raw = fs.readFileSync(csvPath, 'utf8');
@@ -583,8 +744,17 @@ function loadHistoricalRows() {
 
   let headerIdx = -1;
   for (let i = 0; i < csvRows.length; i += 1) {
-    const normalized = csvRows[i].map(normalizeHeader);
-    if (normalized.includes('company') && normalized.includes('total days')) {
+    // Scan cells directly and stop once both header markers are seen,
+    // instead of normalizing every cell of every candidate row up front.
+    let hasCompany = false;
+    let hasTotalDays = false;
+    for (const cell of csvRows[i]) {
+      const normalized = normalizeHeader(cell);
+      if (normalized === 'company') hasCompany = true;
+      else if (normalized === 'total days') hasTotalDays = true;
+      if (hasCompany && hasTotalDays) break;
+    }
+    if (hasCompany && hasTotalDays) {
       headerIdx = i;
       break;
     }
@@ -609,7 +779,7 @@ function loadHistoricalRows() {
     const row = csvRows[i];
     const company = String(row[idxCompany] || '').trim();
     if (!company) continue;
-    const qMatch = company.match(/^Q([1-4])\s+(\d{4})$/i);
+    const qMatch = company.match(QUARTER_HEADER_RE);
     if (qMatch) {
       currentQuarter = `${qMatch[2]} Q${qMatch[1]}`;
       continue;
@@ -618,7 +788,7 @@ function loadHistoricalRows() {
     if (companyLower.startsWith('totals') || companyLower.startsWith('202')) continue;
 
     const totalDaysText = String(row[idxTotalDays] || '').replace(/,/g, '');
-    const daysMatch = totalDaysText.match(/-?\d+/);
+    const daysMatch = totalDaysText.match(SIGNED_INT_RE);
     if (!daysMatch) continue;
     const totalDays = Number(daysMatch[0]);
     if (!Number.isFinite(totalDays) || totalDays <= 0) continue;
@@ -643,7 +813,7 @@ function loadHistoricalRows() {
       kickoff_date: sraKickoff ? formatUSDate(sraKickoff) : nvaKickoff ? formatUSDate(nvaKickoff) : '',
       final_date: formatUSDate(final),
       close_days: totalDays,
-      quarter_label: currentQuarter || quarterFromDate(final),
+      quarter_label: currentQuarter || quarterLabel(final),
       source: 'historical_csv',
     });
   }
@@ -653,7 +823,23 @@ function loadHistoricalRows() {
   return out;
 }
 
+// Display names depend only on the slug and the location flavor, both of
+// which recur constantly; titleCase fallbacks are already cached, so this
+// mostly saves the location parsing and branch walk.
+const STEP_DISPLAY_NAME_CACHE_MAX = 2000;
+const stepDisplayNameCache = new Map();
+
 function stepDisplayName(section, slug, location) {
+  const key = `${slug}|${String(location || '').toLowerCase()}`;
+  const cached = stepDisplayNameCache.get(key);
+  if (cached !== undefined) return cached;
+  const name = stepDisplayNameUncached(slug, location);
+  if (stepDisplayNameCache.size >= STEP_DISPLAY_NAME_CACHE_MAX) stepDisplayNameCache.clear();
+  stepDisplayNameCache.set(key, name);
+  return name;
+}
+
+function stepDisplayNameUncached(slug, location) {
   const loc = String(location || '').toLowerCase();
   const onsite = loc.includes('onsite');
   const remote = loc.includes('remote');
@@ -667,47 +853,124 @@ function stepDisplayName(section, slug, location) {
     if (remote && !onsite) return 'Conduct Interview Sessions';
     return 'Go Onsite/Have Interviews';
   }
-  const labels = {
-    sra_kickoff: 'SRA Kickoff',
-    receive_policies_and_procedures_baa: 'Receive Policies and Procedures / BAA',
-    review_policies_and_procedures_baa: 'Review Policies and Procedures / BAA',
-    recieve_requested_follow_up_documentation: 'Recieve Requested Follow up Documentation',
-    review_sra: 'Review SRA',
-    schedule_final_sra_report: 'Schedule Final SRA Report',
-    present_final_sra_report: 'Present Final SRA Report',
-    nva_kickoff: 'NVA Kickoff',
-    receive_credentials: 'Receive Credentials',
-    verify_access: 'Verify Access',
-    scans_complete: 'Scans Complete',
-    access_removed: 'Access Removed',
-    compile_report: 'Compile Report',
-    schedule_final_nva_report: 'Schedule Final NVA Report',
-    present_final_nva_report: 'Present Final NVA Report',
-  };
-  return labels[slug] || titleCase(slug);
+  return STEP_DISPLAY_LABELS[slug] || titleCase(slug);
+}
+
+const STEP_DISPLAY_LABELS = {
+  sra_kickoff: 'SRA Kickoff',
+  receive_policies_and_procedures_baa: 'Receive Policies and Procedures / BAA',
+  review_policies_and_procedures_baa: 'Review Policies and Procedures / BAA',
+  recieve_requested_follow_up_documentation: 'Recieve Requested Follow up Documentation',
+  review_sra: 'Review SRA',
+  schedule_final_sra_report: 'Schedule Final SRA Report',
+  present_final_sra_report: 'Present Final SRA Report',
+  nva_kickoff: 'NVA Kickoff',
+  receive_credentials: 'Receive Credentials',
+  verify_access: 'Verify Access',
+  scans_complete: 'Scans Complete',
+  access_removed: 'Access Removed',
+  compile_report: 'Compile Report',
+  schedule_final_nva_report: 'Schedule Final NVA Report',
+  present_final_nva_report: 'Present Final NVA Report',
+};
+
+const MEDCURITY_ONLY_STEPS = new Set([
+  'sra_kickoff',
+  'go_onsite_have_interview',
+  'review_sra',
+  'present_final_sra_report',
+  'nva_kickoff',
+  'scans_complete',
+  'access_removed',
+  'present_final_nva_report',
+]);
+const SHARED_OWNER_STEPS = new Set([
+  'schedule_onsite_remote_interview',
+  'receive_policies_and_procedures_baa',
+  'review_policies_and_procedures_baa',
+]);
+
+// Canonical step ordering per track, shared by dashboard assembly and the
+// ECD propagation in the update handler.
+const SRA_STEP_ORDER = [
+  'sra_kickoff',
+  'receive_policies_and_procedures_baa',
+  'review_policies_and_procedures_baa',
+  'schedule_onsite_remote_interview',
+  'go_onsite_have_interview',
+  'recieve_requested_follow_up_documentation',
+  'review_sra',
+  'schedule_final_sra_report',
+  'present_final_sra_report',
+];
+const NVA_STEP_ORDER = [
+  'nva_kickoff',
+  'receive_credentials',
+  'verify_access',
+  'scans_complete',
+  'access_removed',
+  'compile_report',
+  'schedule_final_nva_report',
+  'present_final_nva_report',
+];
+
+// Default ECD offsets (days from kickoff) used when no explicit ECD exists.
+const SRA_ECD_OFFSETS = {
+  receive_policies_and_procedures_baa: 7,
+  review_policies_and_procedures_baa: 19,
+  schedule_onsite_remote_interview: 14,
+  go_onsite_have_interview: 21,
+  recieve_requested_follow_up_documentation: 28,
+  review_sra: 35,
+  schedule_final_sra_report: 42,
+  present_final_sra_report: 49,
+};
+const NVA_ECD_OFFSETS = {
+  receive_credentials: 7,
+  verify_access: 14,
+  scans_complete: 21,
+  access_removed: 28,
+  compile_report: 35,
+  schedule_final_nva_report: 42,
+  present_final_nva_report: 49,
+};
+
+// Slugs covered by the explicit ECD rules; the fallback offset pass in
+// addEcdAcdFields must leave them alone.
+const EXPLICIT_RULE_SLUGS = new Set([...SRA_STEP_ORDER, ...NVA_STEP_ORDER]);
+
+// Precomputed slug->position maps for ordering steps in dashboard output.
+const SRA_STEP_RANK = new Map(SRA_STEP_ORDER.map((slug, i) => [slug, i]));
+const NVA_STEP_RANK = new Map(NVA_STEP_ORDER.map((slug, i) => [slug, i]));
+
+// Metric keys come from the fixed field map, so every row re-splits the
+// same strings; cache the section/slug/field triples.
+const METRIC_KEY_PARTS_CACHE_MAX = 2000;
+const metricKeyPartsCache = new Map();
+
+function splitMetricKey(key) {
+  let parts = metricKeyPartsCache.get(key);
+  if (parts === undefined) {
+    const raw = key.split('.');
+    parts = raw.length >= 3
+      ? { section: raw[0].toLowerCase(), slug: raw[1].toLowerCase(), field: raw[2].toLowerCase() }
+      : null;
+    if (metricKeyPartsCache.size >= METRIC_KEY_PARTS_CACHE_MAX) metricKeyPartsCache.clear();
+    metricKeyPartsCache.set(key, parts);
+  }
+  return parts;
 }
 
 function stepOwner(section, slug, clientName) {
-  const medcurityOnly = new Set([
-    'sra_kickoff',
-    'go_onsite_have_interview',
-    'review_sra',
-    'present_final_sra_report',
-    'nva_kickoff',
-    'scans_complete',
-    'access_removed',
-    'present_final_nva_report',
-  ]);
-  const shared = new Set([
-    'schedule_onsite_remote_interview',
-    'receive_policies_and_procedures_baa',
-    'review_policies_and_procedures_baa',
-  ]);
-  if (medcurityOnly.has(slug)) return 'Medcurity';
-  if (shared.has(slug)) return `Medcurity & ${clientName}`;
+  if (MEDCURITY_ONLY_STEPS.has(slug)) return 'Medcurity';
+  if (SHARED_OWNER_STEPS.has(slug)) return `Medcurity & ${clientName}`;
   return clientName || 'Not assigned';
 }
 
+// Metric fields that bind to a step's ACD; everything except these and
+// "ecd" lands in the step's extras list.
+const ACD_FIELD_NAMES = new Set(['date', 'acd']);
+
 function buildDashboard(row) {
   const metrics = row.metrics || {};
   const location = getMetric(metrics, 'project.remote_onsite', 'project.location');
@@ -728,56 +991,58 @@ function buildDashboard(row) {
 
   const sraSteps = {};
   const nvaSteps = {};
-  const sraOrder = [
-    'sra_kickoff',
-    'receive_policies_and_procedures_baa',
-    'review_policies_and_procedures_baa',
-    'schedule_onsite_remote_interview',
-    'go_onsite_have_interview',
-    'recieve_requested_follow_up_documentation',
-    'review_sra',
-    'schedule_final_sra_report',
-    'present_final_sra_report',
-  ];
-  const nvaOrder = [
-    'nva_kickoff',
-    'receive_credentials',
-    'verify_access',
-    'scans_complete',
-    'access_removed',
-    'compile_report',
-    'schedule_final_nva_report',
-    'present_final_nva_report',
-  ];
 
+  // Each step contributes several metric keys (date/ecd/extras); resolve its
+  // display name once per section.slug instead of per key.
+  const stepNameBySectionSlug = new Map();
+  // The kickoff mirror and present-final sync below need these four step
+  // names; capture them while parsing instead of re-scanning the maps.
+  let sraKickoffName = null;
+  let nvaKickoffName = null;
+  let sraPresentName = null;
+  let nvaPresentName = null;
   for (const [key, value] of Object.entries(metrics)) {
-    const parts = key.split('.');
-    if (parts.length < 3) continue;
-    const section = parts[0].toLowerCase();
+    const parts = splitMetricKey(key);
+    if (!parts) continue;
+    const { section, slug, field } = parts;
     if (section !== 'sra' && section !== 'nva') continue;
-    const slug = parts[1].toLowerCase();
-    const field = parts[2].toLowerCase();
-    const stepName = stepDisplayName(section, slug, location);
+    const nameKey = `${section}.${slug}`;
+    let stepName = stepNameBySectionSlug.get(nameKey);
+    if (!stepName) {
+      stepName = stepDisplayName(section, slug, location);
+      stepNameBySectionSlug.set(nameKey, stepName);
+    }
     const target = section === 'sra' ? sraSteps : nvaSteps;
-    target[stepName] = target[stepName] || {
-      step_slug: slug,
-      Status: 'Not Started',
-      Owner: stepOwner(section, slug, row.task_name),
-      ECD: '',
-      ACD: '',
-      ecd: { editable: true, metric_key: `${section}.${slug}.ecd`, value: '', input_value: '' },
-      acd: { editable: true, metric_key: `${section}.${slug}.date`, value: '', input_value: '' },
-      extras: [],
-      status_class: 'status-pill-neutral',
-      status: 'Not Started',
-    };
+    let step = target[stepName];
+    if (!step) {
+      step = target[stepName] = {
+        step_slug: slug,
+        Status: 'Not Started',
+        Owner: stepOwner(section, slug, row.task_name),
+        ECD: '',
+        ACD: '',
+        ecd: { editable: true, metric_key: `${section}.${slug}.ecd`, value: '', input_value: '' },
+        acd: { editable: true, metric_key: `${section}.${slug}.date`, value: '', input_value: '' },
+        extras: [],
+        status_class: 'status-pill-neutral',
+        status: 'Not Started',
+      };
+      if (section === 'sra') {
+        if (slug === 'sra_kickoff') sraKickoffName = stepName;
+        else if (slug === 'present_final_sra_report') sraPresentName = stepName;
+      } else if (slug === 'nva_kickoff') {
+        nvaKickoffName = stepName;
+      } else if (slug === 'present_final_nva_report') {
+        nvaPresentName = stepName;
+      }
+    }
 
-    if (field === 'date' || field === 'acd') {
-      target[stepName].ACD = String(value || '').trim();
+    if (ACD_FIELD_NAMES.has(field)) {
+      step.ACD = String(value || '').trim();
     } else if (field === 'ecd') {
-      target[stepName].ECD = String(value || '').trim();
+      step.ECD = String(value || '').trim();
     } else {
-      target[stepName].extras.push({ label: titleCase(field), value: String(value || '').trim() || 'Not set' });
+      step.extras.push({ label: titleCase(field), value: String(value || '').trim() || 'Not set' });
     }
   }
 
@@ -786,11 +1051,11 @@ function buildDashboard(row) {
     return stepMap;
   }
 
-  function orderSteps(stepMap, order) {
+  function orderSteps(stepMap, rank) {
     const entries = Object.entries(stepMap);
     entries.sort((a, b) => {
-      const ai = order.indexOf(a[1].step_slug);
-      const bi = order.indexOf(b[1].step_slug);
+      const ai = rank.has(a[1].step_slug) ? rank.get(a[1].step_slug) : -1;
+      const bi = rank.has(b[1].step_slug) ? rank.get(b[1].step_slug) : -1;
       if (ai === -1 && bi === -1) return a[0].localeCompare(b[0]);
       if (ai === -1) return 1;
       if (bi === -1) return -1;
@@ -799,47 +1064,25 @@ function buildDashboard(row) {
     return Object.fromEntries(entries);
   }
 
-  if (showSra && showNva) {
-    const sraKickoff = findStepNameBySlug(sraSteps, 'sra_kickoff');
-    const nvaKickoff = findStepNameBySlug(nvaSteps, 'nva_kickoff');
-    if (sraKickoff && nvaKickoff) {
-      const sraAcd = String(sraSteps[sraKickoff]?.ACD || '').trim();
-      if (sraAcd) nvaSteps[nvaKickoff].ACD = sraAcd;
-    }
+  if (showSra && showNva && sraKickoffName && nvaKickoffName) {
+    const sraAcd = String(sraSteps[sraKickoffName]?.ACD || '').trim();
+    if (sraAcd) nvaSteps[nvaKickoffName].ACD = sraAcd;
   }
 
-  const normalizedSra = normalizeSteps(sraSteps, {
-    receive_policies_and_procedures_baa: 7,
-    review_policies_and_procedures_baa: 19,
-    schedule_onsite_remote_interview: 14,
-    go_onsite_have_interview: 21,
-    recieve_requested_follow_up_documentation: 28,
-    review_sra: 35,
-    schedule_final_sra_report: 42,
-    present_final_sra_report: 49,
-  });
-
-  const normalizedNva = normalizeSteps(nvaSteps, {
-    receive_credentials: 7,
-    verify_access: 14,
-    scans_complete: 21,
-    access_removed: 28,
-    compile_report: 35,
-    schedule_final_nva_report: 42,
-    present_final_nva_report: 49,
-  });
+  const normalizedSra = normalizeSteps(sraSteps, SRA_ECD_OFFSETS);
+  const normalizedNva = normalizeSteps(nvaSteps, NVA_ECD_OFFSETS);
 
-  // Keep Present Final NVA ECD aligned with Present Final SRA ECD.
-  const sraPresentName = findStepNameBySlug(normalizedSra, 'present_final_sra_report');
-  const nvaPresentName = findStepNameBySlug(normalizedNva, 'present_final_nva_report');
+  // Keep Present Final NVA ECD aligned with Present Final SRA ECD
+  // (normalizeSteps keeps the same step names).
   if (sraPresentName && nvaPresentName) {
     const sraEcd = String(normalizedSra[sraPresentName]?.ECD || '').trim();
     if (sraEcd) {
-      normalizedNva[nvaPresentName].ECD = sraEcd;
-      normalizedNva[nvaPresentName].ecd.value = sraEcd;
-      normalizedNva[nvaPresentName].ecd.input_value = toInputDate(sraEcd);
-      normalizedNva[nvaPresentName].status = computeStepStatus(normalizedNva[nvaPresentName]);
-      normalizedNva[nvaPresentName].status_class = statusClass(normalizedNva[nvaPresentName].status);
+      const nvaPresent = normalizedNva[nvaPresentName];
+      nvaPresent.ECD = sraEcd;
+      nvaPresent.ecd.value = sraEcd;
+      nvaPresent.ecd.input_value = toInputDate(sraEcd);
+      nvaPresent.status = computeStepStatus(nvaPresent);
+      nvaPresent.status_class = statusClass(nvaPresent.status);
     }
   }
 
@@ -847,12 +1090,29 @@ function buildDashboard(row) {
     project_details: projectDetails,
     show_sra: showSra,
     show_nva: showNva,
-    sra_steps: orderSteps(normalizedSra, sraOrder),
-    nva_steps: orderSteps(normalizedNva, nvaOrder),
+    sra_steps: orderSteps(normalizedSra, SRA_STEP_RANK),
+    nva_steps: orderSteps(normalizedNva, NVA_STEP_RANK),
     extra_metrics: {},
   };
 }
 
+// Serve stale single-row snapshots immediately and refresh the shared
+// ClickUp cache in the background (one refresh at a time per worker).
+const STATUS_SNAPSHOT_REFRESH_MS = 10 * 60 * 1000;
+let statusRefreshInFlight = false;
+
+function refreshSnapshotIfStale(syncedAt) {
+  const syncedMs = syncedAt ? new Date(syncedAt).getTime() : 0;
+  if (syncedMs && Date.now() - syncedMs <= STATUS_SNAPSHOT_REFRESH_MS) return;
+  if (statusRefreshInFlight) return;
+  statusRefreshInFlight = true;
+  fetchListRows({ force: true })
+    .catch(() => {})
+    .finally(() => {
+      statusRefreshInFlight = false;
+    });
+}
+
 app.http('status', {
   methods: ['GET'],
   authLevel: 'anonymous',
@@ -862,9 +1122,14 @@ app.http('status', {
       const queryObj = Object.fromEntries(req.query.entries());
       const sfId = String(req.query.get('sf_id') || req.query.get('sfId') || '').trim();
       const sig = String(req.query.get('sig') || '').trim();
-      if (!sfId || sig !== sign(sfId)) return json(403, { error: 'forbidden' });
-      const wantsFresh = ['1', 'true', 'yes'].includes(String(req.query.get('fresh') || '').trim().toLowerCase());
+      if (!sfId || !verifySignature(sfId, sig)) return json(403, { error: 'forbidden' });
+      const wantsFresh = parseBool(req.query.get('fresh'));
       const adminRequest = isAdmin({ query: queryObj, headers: req.headers });
+      // Overrides ride along with the status payload, fetched concurrently
+      // with the row so the page skips its follow-up ecdOverrides request.
+      const overridesPromise = hasSqlConfig()
+        ? getOverrides(sfId).catch(() => null)
+        : Promise.resolve(null);
       let row = null;
 
       // Fast path for client links: single-row SQL snapshot lookup.
@@ -876,6 +1141,7 @@ app.http('status', {
             if (!row.synced_at && cached.syncedAt) {
               row.synced_at = String(cached.syncedAt);
             }
+            refreshSnapshotIfStale(cached.syncedAt);
           }
         } catch (_) {
           // Fall back to list fetch below.
@@ -883,12 +1149,21 @@ app.http('status', {
       }
 
       if (!row) {
-        const rows = await fetchListRows({ force: wantsFresh && adminRequest });
+        // Admin fresh=1 loads no longer block on a forced ClickUp fetch: the
+        // update handler already force-refreshes after edits, so serve the
+        // shared cache and kick the refresh into the background instead.
+        if (wantsFresh && adminRequest) refreshSnapshotIfStale(null);
+        const rows = await fetchListRows();
         row = rows.find((r) => r.sf_id === sfId) || null;
       }
 
       if (!row) return json(404, { error: 'not_found' });
-      return json(200, { ...row, dashboard: buildDashboard(row) });
+      const body = { ...row, dashboard: buildDashboard(row) };
+      const overrides = await overridesPromise;
+      if (overrides) {
+        body.ecd_overrides = { enabled: true, backend: 'azure_sql', overrides };
+      }
+      return jsonConditional(req, body);
     } catch (err) {
       ctx.error(err);
       return json(500, { error: 'server_error', detail: String(err.message || err) });
@@ -896,6 +1171,11 @@ app.http('status', {
   },
 });
 
+// Built admin project payloads keyed by the rows snapshot identity; the
+// ClickUp list cache swaps in a new array on refresh, which invalidates this.
+let adminProjectsCacheRows = null;
+let adminProjectsCachePayload = null;
+
 app.http('projects', {
   methods: ['GET'],
   authLevel: 'anonymous',
@@ -905,22 +1185,30 @@ app.http('projects', {
       if (!isAdmin({ query: Object.fromEntries(req.query.entries()), headers: req.headers })) {
         return json(401, { error: 'unauthorized' });
       }
-      const refresh = ['1', 'true', 'yes'].includes(String(req.query.get('refresh') || '').trim().toLowerCase());
+      const refresh = parseBool(req.query.get('refresh'));
       const rows = await fetchListRows({ force: refresh, includeComments: refresh });
-      const projects = rows.map((r) => ({
-        sf_id: r.sf_id,
-        task_name: r.task_name,
-        task_status: r.task_status,
-        source_updated_at: r.source_updated_at,
-        task_created_at: r.task_created_at,
-        task_closed_at: r.task_closed_at,
-        sra_final_date: getMetric(r.metrics || {}, 'sra.present_final_sra_report.date', 'sra.present_final_sra_report.acd'),
-        nva_final_date: getMetric(r.metrics || {}, 'nva.present_final_nva_report.date', 'nva.present_final_nva_report.acd'),
-        project_lead: getMetric(r.metrics || {}, 'project.project_lead') || 'Not assigned',
-        project_support: getMetric(r.metrics || {}, 'project.project_support') || '',
-        link_sig: sign(r.sf_id),
-      }));
-      return json(200, { count: projects.length, projects });
+      if (rows === adminProjectsCacheRows && adminProjectsCachePayload) {
+        return jsonConditional(req, adminProjectsCachePayload);
+      }
+      const projects = rows.map((r) => {
+        const m = r.metrics || {};
+        return {
+          sf_id: r.sf_id,
+          task_name: r.task_name,
+          task_status: r.task_status,
+          source_updated_at: r.source_updated_at,
+          task_created_at: r.task_created_at,
+          task_closed_at: r.task_closed_at,
+          sra_final_date: getMetric(m, 'sra.present_final_sra_report.date', 'sra.present_final_sra_report.acd'),
+          nva_final_date: getMetric(m, 'nva.present_final_nva_report.date', 'nva.present_final_nva_report.acd'),
+          project_lead: getMetric(m, 'project.project_lead') || 'Not assigned',
+          project_support: getMetric(m, 'project.project_support') || '',
+          link_sig: sign(r.sf_id),
+        };
+      });
+      adminProjectsCacheRows = rows;
+      adminProjectsCachePayload = { count: projects.length, projects };
+      return jsonConditional(req, adminProjectsCachePayload);
     } catch (err) {
       ctx.error(err);
       return json(500, { error: 'server_error', detail: String(err.message || err) });
@@ -942,26 +1230,24 @@ app.http('assessorProjects', {
 
       const rows = await fetchListRows();
       const projects = rows
-        .map((r) => ({
-          sf_id: r.sf_id,
-          task_name: r.task_name,
-          task_status: r.task_status,
-          source_updated_at: r.source_updated_at,
-          project_lead: getMetric(r.metrics || {}, 'project.project_lead') || 'Not assigned',
-          primary_work_month: normalizeWorkMonth(
-            getMetric(
-              r.metrics || {},
-              'project.month_year',
-              'project.primary_work_month',
-              'project.work_month'
-            )
-          ),
-          link_sig: sign(r.sf_id),
-        }))
+        .map((r) => {
+          const m = r.metrics || {};
+          return {
+            sf_id: r.sf_id,
+            task_name: r.task_name,
+            task_status: r.task_status,
+            source_updated_at: r.source_updated_at,
+            project_lead: getMetric(m, 'project.project_lead') || 'Not assigned',
+            primary_work_month: normalizeWorkMonth(
+              getMetric(m, 'project.month_year', 'project.primary_work_month', 'project.work_month')
+            ),
+            link_sig: sign(r.sf_id),
+          };
+        })
         .filter((p) => leadMatches(p.project_lead, access.lead_values))
         .sort((a, b) => String(a.task_name || '').localeCompare(String(b.task_name || '')));
 
-      return json(200, {
+      return jsonConditional(req, {
         assessor_name: access.assessor_name,
         lead_values: access.lead_values,
         access_mode: access.mode || (token ? 'token' : 'signed_lead'),
@@ -987,8 +1273,8 @@ app.http('generateAssessorLink', {
       const lead = String(req.query.get('lead') || '').trim();
       if (!lead) return json(400, { error: 'missing_lead' });
       const explicitRedirect = String(req.query.get('redirect') || '').trim().toLowerCase();
-      const wantsRedirect = ['1', 'true', 'yes'].includes(explicitRedirect);
-      const wantsJson = ['0', 'false', 'no'].includes(explicitRedirect);
+      const wantsRedirect = TRUE_VALUES.has(explicitRedirect);
+      const wantsJson = FALSE_VALUES.has(explicitRedirect);
       const acceptHeader = String((req.headers?.get && req.headers.get('accept')) || '').toLowerCase();
       const browserHtmlRequest = acceptHeader.includes('text/html');
       const sig = signAssessorLead(lead);
@@ -1062,6 +1348,12 @@ app.http('assessors', {
   },
 });
 
+// Metrics payloads keyed on the identities of both inputs; either cache
+// swapping in a new array invalidates this.
+let metricsCacheRows = null;
+let metricsCacheHistorical = null;
+let metricsCachePayload = null;
+
 app.http('metrics', {
   methods: ['GET'],
   authLevel: 'anonymous',
@@ -1072,6 +1364,10 @@ app.http('metrics', {
         return json(401, { error: 'unauthorized' });
       }
       const rows = await fetchListRows();
+      const historicalItems = loadHistoricalRows();
+      if (rows === metricsCacheRows && historicalItems === metricsCacheHistorical && metricsCachePayload) {
+        return jsonConditional(req, metricsCachePayload);
+      }
       const TRACKED_MAX_CLOSE_DAYS = 120;
       const completed = rows.filter((r) => String(r.task_status || '').toLowerCase() === 'completed');
       const liveItems = [];
@@ -1084,11 +1380,27 @@ app.http('metrics', {
         const m = r.metrics || {};
         let hasValid = false;
 
-        const sraStart = parseAnyUSDate(getMetric(m, 'sra.sra_kickoff.date', 'sra.sra_kickoff.acd'));
-        const sraEnd = parseAnyUSDate(getMetric(m, 'sra.present_final_sra_report.date', 'sra.present_final_sra_report.acd'));
-        const sraDays = dateDiffBusinessDays(sraStart, sraEnd);
+        // One pass over the metric keys resolves both track-prefix flags.
+        let hasSraKeys = false;
+        let hasNvaKeys = false;
+        for (const k of Object.keys(m)) {
+          if (k.startsWith('sra.')) hasSraKeys = true;
+          else if (k.startsWith('nva.')) hasNvaKeys = true;
+          if (hasSraKeys && hasNvaKeys) break;
+        }
+
+        // Without sra.* keys the kickoff/final lookups can only be empty, so
+        // skip the date parsing for projects that never ran the track.
+        let sraStart = null;
+        let sraEnd = null;
+        let sraDays = null;
+        if (hasSraKeys) {
+          sraStart = parseAnyUSDate(getMetric(m, 'sra.sra_kickoff.date', 'sra.sra_kickoff.acd'));
+          sraEnd = parseAnyUSDate(getMetric(m, 'sra.present_final_sra_report.date', 'sra.present_final_sra_report.acd'));
+          sraDays = dateDiffBusinessDays(sraStart, sraEnd);
+        }
         const sraEnabled = parseBool(getMetric(m, 'project.sra_enabled', 'sra.enabled', 'sra_enabled'));
-        const sraRelevant = sraEnabled === true || Object.keys(m).some((k) => String(k).startsWith('sra.'));
+        const sraRelevant = sraEnabled === true || hasSraKeys;
         if (sraDays) {
           hasValid = true;
           liveItems.push({
@@ -1105,11 +1417,16 @@ app.http('metrics', {
           missingSraDates += 1;
         }
 
-        const nvaStart = parseAnyUSDate(getMetric(m, 'nva.nva_kickoff.date', 'nva.nva_kickoff.acd'));
-        const nvaEnd = parseAnyUSDate(getMetric(m, 'nva.present_final_nva_report.date', 'nva.present_final_nva_report.acd'));
-        const nvaDays = dateDiffBusinessDays(nvaStart, nvaEnd);
+        let nvaStart = null;
+        let nvaEnd = null;
+        let nvaDays = null;
+        if (hasNvaKeys) {
+          nvaStart = parseAnyUSDate(getMetric(m, 'nva.nva_kickoff.date', 'nva.nva_kickoff.acd'));
+          nvaEnd = parseAnyUSDate(getMetric(m, 'nva.present_final_nva_report.date', 'nva.present_final_nva_report.acd'));
+          nvaDays = dateDiffBusinessDays(nvaStart, nvaEnd);
+        }
         const nvaEnabled = parseBool(getMetric(m, 'project.nva_enabled', 'nva.enabled', 'nva_enabled'));
-        const nvaRelevant = nvaEnabled === true || Object.keys(m).some((k) => String(k).startsWith('nva.'));
+        const nvaRelevant = nvaEnabled === true || hasNvaKeys;
         if (nvaDays) {
           hasValid = true;
           liveItems.push({
@@ -1130,87 +1447,101 @@ app.http('metrics', {
         else missingRecords.push({ company: r.task_name || '', sf_id: r.sf_id || '' });
       }
 
-      const historicalItems = loadHistoricalRows();
-      const historicalKeys = new Set(
-        historicalItems.map((r) => [
-          normalizeCompanyName(r.company),
-          String(r.track || '').toUpperCase(),
-          String(r.kickoff_date || '').trim(),
-          String(r.final_date || '').trim(),
-        ].join('|'))
-      );
-      const liveDeduped = liveItems.filter((r) => {
-        const key = [
-          normalizeCompanyName(r.company),
-          String(r.track || '').toUpperCase(),
-          String(r.kickoff_date || '').trim(),
-          String(r.final_date || '').trim(),
-        ].join('|');
-        return !historicalKeys.has(key);
-      });
+      const { keys: historicalKeys, companies: historicalCompanies, sfIds: historicalSfIds } = historicalIndex(historicalItems);
+      const liveDeduped = liveItems.filter((r) => !historicalKeys.has(closeRowKey(r)));
 
       const allRows = [...historicalItems, ...liveDeduped];
-      allRows.sort((a, b) => {
-        const ad = parseAnyUSDate(a.final_date);
-        const bd = parseAnyUSDate(b.final_date);
-        const at = ad ? ad.getTime() : 0;
-        const bt = bd ? bd.getTime() : 0;
-        return bt - at;
-      });
+      // Parse each final_date once before sorting instead of per comparison.
+      const finalMs = new Map(allRows.map((r) => {
+        const d = parseAnyUSDate(r.final_date);
+        return [r, d ? d.getTime() : 0];
+      }));
+      allRows.sort((a, b) => finalMs.get(b) - finalMs.get(a));
 
-      const allDays = allRows.map((r) => Number(r.close_days)).filter((n) => Number.isFinite(n) && n > 0);
-      const sraRows = allRows.filter((r) => String(r.track || '').toUpperCase().includes('SRA'));
-      const nvaRows = allRows.filter((r) => String(r.track || '').toUpperCase().includes('NVA'));
-      const sraDays = sraRows.map((r) => Number(r.close_days)).filter((n) => Number.isFinite(n) && n > 0);
-      const nvaDays = nvaRows.map((r) => Number(r.close_days)).filter((n) => Number.isFinite(n) && n > 0);
-      const trackedDays = allDays.filter((d) => d <= TRACKED_MAX_CLOSE_DAYS);
-      const avg = allDays.length ? Math.round((allDays.reduce((a, b) => a + b, 0) / allDays.length) * 10) / 10 : null;
-      const sraAvg = sraDays.length ? Math.round((sraDays.reduce((a, b) => a + b, 0) / sraDays.length) * 10) / 10 : null;
-      const nvaAvg = nvaDays.length ? Math.round((nvaDays.reduce((a, b) => a + b, 0) / nvaDays.length) * 10) / 10 : null;
+      // One pass classifies tracks and accumulates every close-day stat the
+      // summary needs; no intermediate day arrays or repeated filters.
+      function avgTenth(sum, count) {
+        return count ? Math.round((sum / count) * 10) / 10 : null;
+      }
+      const sraRows = [];
+      const nvaRows = [];
+      let allCount = 0;
+      let allSum = 0;
+      let sraSum = 0;
+      let sraDayCount = 0;
+      let nvaSum = 0;
+      let nvaDayCount = 0;
+      let trackedCount = 0;
+      let trackedSum = 0;
+      for (const r of allRows) {
+        const track = String(r.track || '').toUpperCase();
+        const isSra = track.includes('SRA');
+        const isNva = track.includes('NVA');
+        if (isSra) sraRows.push(r);
+        if (isNva) nvaRows.push(r);
+        const days = Number(r.close_days);
+        if (!Number.isFinite(days) || days <= 0) continue;
+        allCount += 1;
+        allSum += days;
+        if (isSra) {
+          sraDayCount += 1;
+          sraSum += days;
+        }
+        if (isNva) {
+          nvaDayCount += 1;
+          nvaSum += days;
+        }
+        if (days <= TRACKED_MAX_CLOSE_DAYS) {
+          trackedCount += 1;
+          trackedSum += days;
+        }
+      }
+      const avg = avgTenth(allSum, allCount);
+      const sraAvg = avgTenth(sraSum, sraDayCount);
+      const nvaAvg = avgTenth(nvaSum, nvaDayCount);
 
-      const grouped = new Map();
-      for (const row of allRows) {
+      // Running {count, sum} accumulators; averages never need the raw lists.
+      function accumulateQuarter(map, row) {
         const q = String(row.quarter_label || '');
-        if (!grouped.has(q)) grouped.set(q, []);
-        grouped.get(q).push(Number(row.close_days));
+        const days = Number(row.close_days);
+        const entry = map.get(q);
+        if (entry) {
+          entry.count += 1;
+          entry.sum += days;
+        } else {
+          map.set(q, { count: 1, sum: days });
+        }
       }
+      const grouped = new Map();
+      for (const row of allRows) accumulateQuarter(grouped, row);
       const groupedSra = new Map();
-      for (const row of sraRows) {
-        const q = String(row.quarter_label || '');
-        if (!groupedSra.has(q)) groupedSra.set(q, []);
-        groupedSra.get(q).push(Number(row.close_days));
-      }
+      for (const row of sraRows) accumulateQuarter(groupedSra, row);
       const groupedNva = new Map();
-      for (const row of nvaRows) {
-        const q = String(row.quarter_label || '');
-        if (!groupedNva.has(q)) groupedNva.set(q, []);
-        groupedNva.get(q).push(Number(row.close_days));
-      }
+      for (const row of nvaRows) accumulateQuarter(groupedNva, row);
+      // Parse each quarter label once and compare numeric sort keys.
       const quarterRows = Array.from(grouped.keys())
+        .map((q) => {
+          const p = String(q).match(QUARTER_LABEL_RE);
+          return [p ? Number(p[1]) * 4 + Number(p[2]) : -1, q];
+        })
         .sort((a, b) => {
-          const pa = String(a).match(/^(\d{4}) Q([1-4])$/);
-          const pb = String(b).match(/^(\d{4}) Q([1-4])$/);
-          if (!pa && !pb) return String(a).localeCompare(String(b));
-          if (!pa) return -1;
-          if (!pb) return 1;
-          if (pa[1] !== pb[1]) return Number(pa[1]) - Number(pb[1]);
-          return Number(pa[2]) - Number(pb[2]);
+          if (a[0] < 0 && b[0] < 0) return String(a[1]).localeCompare(String(b[1]));
+          return a[0] - b[0];
         })
+        .map((pair) => pair[1])
         .map((q) => {
-          const vals = grouped.get(q) || [];
-          const sVals = groupedSra.get(q) || [];
-          const nVals = groupedNva.get(q) || [];
+          const vals = grouped.get(q);
+          const sVals = groupedSra.get(q);
+          const nVals = groupedNva.get(q);
           return {
             quarter: q,
-            count: vals.length,
-            avg_close_days: vals.length ? Math.round((vals.reduce((a, b) => a + b, 0) / vals.length) * 10) / 10 : null,
-            avg_sra_days: sVals.length ? Math.round((sVals.reduce((a, b) => a + b, 0) / sVals.length) * 10) / 10 : null,
-            avg_nva_days: nVals.length ? Math.round((nVals.reduce((a, b) => a + b, 0) / nVals.length) * 10) / 10 : null,
+            count: vals ? vals.count : 0,
+            avg_close_days: vals && vals.count ? Math.round((vals.sum / vals.count) * 10) / 10 : null,
+            avg_sra_days: sVals && sVals.count ? Math.round((sVals.sum / sVals.count) * 10) / 10 : null,
+            avg_nva_days: nVals && nVals.count ? Math.round((nVals.sum / nVals.count) * 10) / 10 : null,
           };
         });
 
-      const historicalCompanies = new Set(historicalItems.map((r) => normalizeCompanyName(r.company)).filter(Boolean));
-      const historicalSfIds = new Set(historicalItems.map((r) => String(r.sf_id || '').trim()).filter(Boolean));
       let coveredByHistorical = 0;
       let uncovered = 0;
       for (const m of missingRecords) {
@@ -1232,7 +1563,7 @@ app.http('metrics', {
       };
       const coveragePct = completed.length ? Math.round((100 * completedWithValidClose / completed.length) * 10) / 10 : null;
 
-      return json(200, {
+      const payload = {
         summary: {
           total_tracked_closures: allRows.length,
           avg_close_days: avg,
@@ -1240,9 +1571,9 @@ app.http('metrics', {
           sra_count: sraRows.length,
           nva_avg_close_days: nvaAvg,
           nva_count: nvaRows.length,
-          tracked_avg_days: trackedDays.length ? Math.round((trackedDays.reduce((a, b) => a + b, 0) / trackedDays.length) * 10) / 10 : null,
-          tracked_count: trackedDays.length,
-          untracked_outlier_count: Math.max(allDays.length - trackedDays.length, 0),
+          tracked_avg_days: avgTenth(trackedSum, trackedCount),
+          tracked_count: trackedCount,
+          untracked_outlier_count: Math.max(allCount - trackedCount, 0),
           tracked_max_days: TRACKED_MAX_CLOSE_DAYS,
           historical_count: historicalItems.length,
           live_count: liveDeduped.length,
@@ -1260,7 +1591,11 @@ app.http('metrics', {
           final_date: r.final_date,
           sf_id: r.sf_id || '',
         })),
-      });
+      };
+      metricsCacheRows = rows;
+      metricsCacheHistorical = historicalItems;
+      metricsCachePayload = payload;
+      return jsonConditional(req, payload);
     } catch (err) {
       ctx.error(err);
       return json(500, { error: 'server_error', detail: String(err.message || err) });
@@ -1283,7 +1618,8 @@ app.http('generateLink', {
       const relative = `/status?sf_id=${encodeURIComponent(sfId)}&sig=${signature}`;
       const base = getClientBaseUrl();
       const clientUrl = base ? `${base}${relative}` : relative;
-      await upsertClientLink({ sfId, signature, clientUrl }).catch(() => {});
+      // Best-effort bookkeeping; don't hold the response for the write.
+      upsertClientLink({ sfId, signature, clientUrl }).catch(() => {});
       return json(200, {
         sf_id: sfId,
         signature,
@@ -1307,7 +1643,7 @@ app.http('ecdOverrides', {
       if (method === 'GET') {
         const sfId = String(req.query.get('sf_id') || req.query.get('sfId') || '').trim();
         const sig = String(req.query.get('sig') || '').trim();
-        if (!sfId || sig !== sign(sfId)) return json(403, { error: 'forbidden' });
+        if (!sfId || !verifySignature(sfId, sig)) return json(403, { error: 'forbidden' });
         const overrides = await getOverrides(sfId);
         return json(200, {
           enabled: hasSqlConfig(),
@@ -1324,15 +1660,15 @@ app.http('ecdOverrides', {
       const sfId = String(body.sf_id || '').trim();
       const sig = String(body.sig || '').trim();
       const overrides = body.overrides && typeof body.overrides === 'object' ? body.overrides : {};
-      if (!sfId || sig !== sign(sfId)) return json(400, { error: 'invalid_payload' });
+      if (!sfId || !verifySignature(sfId, sig)) return json(400, { error: 'invalid_payload' });
       const ok = await replaceOverrides(sfId, overrides, requestActor(req));
       if (!ok) return json(200, { enabled: false, backend: 'none', sf_id: sfId, saved: false });
-      await recordAuditEvent({
+      queueAuditEvent({
         sfId,
         eventType: 'ecd_overrides_replace',
         actor: requestActor(req),
         metadata: { override_count: Object.keys(overrides || {}).length },
-      }).catch(() => {});
+      });
       return json(200, { enabled: true, backend: 'azure_sql', sf_id: sfId, saved: true });
     } catch (err) {
       ctx.error(err);
@@ -1373,7 +1709,7 @@ app.http('update', {
       const value = String(body.value || '').trim();
       const sig = String(body.sig || '').trim();
       const adjustFollowing = String(body.adjust_following || 'yes').trim().toLowerCase() !== 'no';
-      if (!sfId || !metricKey || !sig || sig !== sign(sfId)) return json(400, { error: 'invalid_payload' });
+      if (!sfId || !metricKey || !verifySignature(sfId, sig)) return json(400, { error: 'invalid_payload' });
 
       const rows = await fetchListRows();
       const row = rows.find((r) => r.sf_id === sfId);
@@ -1386,11 +1722,12 @@ app.http('update', {
       const isEcdMetric = metricParts.length === 3 && metricParts[2] === 'ecd';
       if (!fieldId && !isEcdMetric) return json(400, { error: 'field_not_mapped', metric_key: metricKey });
 
+      const metrics = row.metrics || {};
       const clickupValue = value ? toClickupMsFromYmd(value) : null;
       const priorValue = String(
-        row.metrics?.[metricKey] ||
-        row.metrics?.[metricKey.replace(/\.date$/i, '.acd')] ||
-        row.metrics?.[metricKey.replace(/\.acd$/i, '.date')] ||
+        metrics[metricKey] ||
+        metrics[metricKey.replace(/\.date$/i, '.acd')] ||
+        metrics[metricKey.replace(/\.acd$/i, '.date')] ||
         ''
       ).trim();
       if (fieldId) {
@@ -1403,57 +1740,36 @@ app.http('update', {
       if (parts.length === 3 && parts[2] === 'ecd' && adjustFollowing) {
         const section = parts[0];
         const slug = parts[1];
-        const oldDate = parseAnyUSDate(row.metrics?.[metricKey] || '');
-        const newMs = toClickupMsFromYmd(value);
-        const newDate = newMs != null ? new Date(newMs) : null;
+        // For ECD keys the alias fallbacks never match, so priorValue is
+        // exactly the stored metric; reuse it and the already-computed ms.
+        const oldDate = parseAnyUSDate(priorValue);
+        const newDate = clickupValue != null ? new Date(clickupValue) : null;
         if (oldDate && newDate) {
           const deltaDays = diffCalendarDays(newDate, oldDate);
           if (deltaDays !== 0) {
-            const sraOrder = [
-              'sra_kickoff',
-              'receive_policies_and_procedures_baa',
-              'review_policies_and_procedures_baa',
-              'schedule_onsite_remote_interview',
-              'go_onsite_have_interview',
-              'recieve_requested_follow_up_documentation',
-              'review_sra',
-              'schedule_final_sra_report',
-              'present_final_sra_report',
-            ];
-            const nvaOrder = [
-              'nva_kickoff',
-              'receive_credentials',
-              'verify_access',
-              'scans_complete',
-              'access_removed',
-              'compile_report',
-              'schedule_final_nva_report',
-              'present_final_nva_report',
-            ];
-            const order = section === 'sra' ? sraOrder : section === 'nva' ? nvaOrder : [];
+            const order = section === 'sra' ? SRA_STEP_ORDER : section === 'nva' ? NVA_STEP_ORDER : [];
             const idx = order.indexOf(slug);
             if (idx >= 0) {
-              for (const laterSlug of order.slice(idx + 1)) {
+              for (let i = idx + 1; i < order.length; i += 1) {
+                const laterSlug = order[i];
                 const laterAcdKey = `${section}.${laterSlug}.date`;
-                const laterAcd = parseAnyUSDate(row.metrics?.[laterAcdKey] || row.metrics?.[`${section}.${laterSlug}.acd`] || '');
+                const laterAcd = parseAnyUSDate(metrics[laterAcdKey] || metrics[`${section}.${laterSlug}.acd`] || '');
                 if (laterAcd) continue;
 
                 const laterEcdKey = `${section}.${laterSlug}.ecd`;
                 const laterResolved = resolveFieldId(fieldMap, laterEcdKey);
                 const laterFieldId = laterResolved?.id;
-                const laterCurrent = parseAnyUSDate(row.metrics?.[laterEcdKey] || '');
+                const laterCurrent = parseAnyUSDate(metrics[laterEcdKey] || '');
                 if (!laterFieldId || !laterCurrent) continue;
 
                 const shifted = shiftBusinessSafe(laterCurrent, deltaDays);
-                const shiftedMs = toClickupMsFromUs(formatUSDate(shifted));
-                if (shiftedMs == null) continue;
-                await updateCustomField(row.task_id, laterFieldId, shiftedMs);
+                await updateCustomField(row.task_id, laterFieldId, toClickupMsFromDate(shifted));
               }
             }
           }
         }
       }
-      await recordAuditEvent({
+      queueAuditEvent({
         sfId,
         taskId: row.task_id,
         eventType: isEcdMetric ? 'ecd_update' : 'acd_update',
@@ -1466,7 +1782,7 @@ app.http('update', {
           clickup_field_mapped: !!fieldId,
           local_only: !fieldId && isEcdMetric,
         },
-      }).catch(() => {});
+      });
 
       // Keep client/admin views in sync immediately after edit.
       try {